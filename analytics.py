@@ -0,0 +1,325 @@
+import numpy as np
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, Tuple
+from numpy.typing import ArrayLike
+
+from sim import CellularAutomaton
+
+
+# Game of Life still lifes, oscillators and spaceships counted by the census
+# Each shape is given in one phase and orientation, the others are generated
+# Values are (shape, period), still lifes have period 1
+PATTERNS: Dict[str, Tuple[np.ndarray, int]] = {
+    "block": (np.array([
+        [1, 1],
+        [1, 1]
+    ]), 1),
+    "beehive": (np.array([
+        [0, 1, 1, 0],
+        [1, 0, 0, 1],
+        [0, 1, 1, 0]
+    ]), 1),
+    "loaf": (np.array([
+        [0, 1, 1, 0],
+        [1, 0, 0, 1],
+        [0, 1, 0, 1],
+        [0, 0, 1, 0]
+    ]), 1),
+    "boat": (np.array([
+        [1, 1, 0],
+        [1, 0, 1],
+        [0, 1, 0]
+    ]), 1),
+    "tub": (np.array([
+        [0, 1, 0],
+        [1, 0, 1],
+        [0, 1, 0]
+    ]), 1),
+    "blinker": (np.array([
+        [1, 1, 1]
+    ]), 2),
+    "toad": (np.array([
+        [0, 1, 1, 1],
+        [1, 1, 1, 0]
+    ]), 2),
+    "beacon": (np.array([
+        [1, 1, 0, 0],
+        [1, 1, 0, 0],
+        [0, 0, 1, 1],
+        [0, 0, 1, 1]
+    ]), 2),
+    "glider": (np.array([
+        [0, 1, 0],
+        [0, 0, 1],
+        [1, 1, 1]
+    ]), 4)
+}
+
+
+def _crop(
+    grid_state: np.ndarray
+) -> np.ndarray:
+    """
+    Helper function for _pattern_variants(). Crops a grid to the bounding box of its living cells.
+    """
+
+    rows: np.ndarray = np.flatnonzero(grid_state.any(axis=1))
+    cols: np.ndarray = np.flatnonzero(grid_state.any(axis=0))
+    return grid_state[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]
+
+
+def _pattern_variants(
+    pattern: np.ndarray,
+    period: int
+) -> list[np.ndarray]:
+    """
+    Helper function for _pattern_index().
+    Returns every distinct phase, rotation and reflection of a pattern, cropped to its bounding box.
+    """
+
+    # Generate phases by running the pattern in isolation with the Game of Life rule
+    margin: int = period + 2
+    board: np.ndarray = np.pad(pattern, margin)
+    ca: CellularAutomaton = CellularAutomaton(board, engine="numpy")
+    phases: list[np.ndarray] = []
+    for _, grid_state in ca.rollout(period - 1, copy=True):
+        phases.append(_crop(grid_state))
+
+    # Add the 8 symmetries of each phase, keeping only distinct shapes
+    variants: Dict[Tuple[Tuple[int, int], bytes], np.ndarray] = {}
+    for phase in phases:
+        for rotation in range(4):
+            for variant in (np.rot90(phase, rotation), np.fliplr(np.rot90(phase, rotation))):
+                variant: np.ndarray = np.ascontiguousarray(variant, dtype=np.int64)
+                variants[(variant.shape, variant.tobytes())] = variant
+    return list(variants.values())
+
+
+@lru_cache(maxsize=None)
+def _pattern_index() -> Tuple[Dict[Tuple[int, int], Tuple[np.ndarray, np.ndarray]], Tuple[str, ...]]:
+    """
+    Helper function for census().
+    Hashes every pattern variant, surrounded by a one cell dead border, into an integer code.
+    Variants are grouped by window shape so each shape is scanned once.
+
+    Returns
+    ----------
+    index : dict
+        Maps each window shape to (sorted codes, pattern number of each code).
+    names : tuple of str
+        Pattern names in pattern number order.
+    """
+
+    names: Tuple[str, ...] = tuple(PATTERNS.keys())
+    codes_by_shape: Dict[Tuple[int, int], Dict[int, int]] = {}
+    for pattern_number, (pattern, period) in enumerate(PATTERNS.values()):
+        for variant in _pattern_variants(pattern, period):
+            # The dead border makes the pattern match only when it is isolated
+            window: np.ndarray = np.pad(variant, 1)
+            codes_by_shape.setdefault(window.shape, {})[_window_code(window)] = pattern_number
+
+    index: Dict[Tuple[int, int], Tuple[np.ndarray, np.ndarray]] = {}
+    for window_shape, pattern_numbers in codes_by_shape.items():
+        codes: np.ndarray = np.array(sorted(pattern_numbers), dtype=np.int64)
+        index[window_shape] = (codes, np.array([pattern_numbers[code] for code in codes]))
+    return index, names
+
+
+def _window_code(
+    window: np.ndarray
+) -> int:
+    """
+    Helper function for _pattern_index(). Reads a window's cells in row-major order as the bits of an integer.
+    """
+
+    return int(np.sum(window.ravel().astype(np.int64) << np.arange(window.size, dtype=np.int64)))
+
+
+def _sliding_window_codes(
+    grid_state: np.ndarray,
+    window_shape: Tuple[int, int]
+) -> np.ndarray:
+    """
+    Helper function for census().
+    Computes the code of the window starting at every cell of the toroidal grid,
+    with one shifted pass per window cell instead of materializing every window.
+    """
+
+    window_rows, window_cols = window_shape
+    num_rows, num_cols = grid_state.shape
+    # Wrap the grid so windows starting near the edges continue on the opposite side
+    padded: np.ndarray = np.pad(grid_state.astype(np.int64, copy=False), ((0, window_rows - 1), (0, window_cols - 1)), mode="wrap")
+    codes: np.ndarray = np.zeros(grid_state.shape, dtype=np.int64)
+    for row in range(window_rows):
+        for col in range(window_cols):
+            codes |= padded[row:row + num_rows, col:col + num_cols] << (row * window_cols + col)
+    return codes
+
+
+def census(
+    grid_state: ArrayLike
+) -> Dict[str, int]:
+    """
+    Counts isolated copies of each shape in PATTERNS, in any phase, rotation or reflection.
+    A copy only counts if every cell around its bounding box is dead.
+    The shapes are Game of Life patterns, but they are counted as shapes under any rule.
+
+    Parameters
+    ----------
+    grid_state : array-like
+        Binary 2D grid state.
+
+    Returns
+    ----------
+    counts : dict
+        Maps each pattern name to its number of copies.
+    """
+
+    grid_state: np.ndarray = np.asarray(grid_state)
+    index, names = _pattern_index()
+    counts: np.ndarray = np.zeros(len(names), dtype=int)
+    for window_shape, (known_codes, pattern_numbers) in index.items():
+        # Windows larger than the grid would overlap themselves on the torus
+        if window_shape[0] > grid_state.shape[0] or window_shape[1] > grid_state.shape[1]:
+            continue
+        codes: np.ndarray = _sliding_window_codes(grid_state, window_shape)
+        # Look every code up in the sorted known codes and keep exact matches
+        positions: np.ndarray = np.minimum(np.searchsorted(known_codes, codes), len(known_codes) - 1)
+        matches: np.ndarray = known_codes[positions] == codes
+        counts += np.bincount(pattern_numbers[positions[matches]], minlength=len(names))
+    return dict(zip(names, counts.tolist()))
+
+
+def density_map(
+    grid_state: ArrayLike,
+    block: int
+) -> np.ndarray:
+    """
+    Coarse-grains a grid into the fraction of living cells in each block x block block.
+    Rows and columns that do not fill a whole block are dropped.
+
+    Parameters
+    ----------
+    grid_state : array-like
+        Binary 2D grid state.
+    block : int
+        Side length of the pooling blocks.
+
+    Returns
+    ----------
+    densities : np.ndarray
+        Array of shape (rows // block, cols // block) with values between 0 and 1.
+    """
+
+    if block < 1:
+        raise ValueError(f"block must be a positive integer. Received {block}.")
+    grid_state: np.ndarray = np.asarray(grid_state)
+    num_rows: int = grid_state.shape[0] // block
+    num_cols: int = grid_state.shape[1] // block
+    # Reshape the cropped grid into a view with separate axes within each block, then sum them
+    blocks: np.ndarray = grid_state[:num_rows * block, :num_cols * block].reshape(num_rows, block, num_cols, block)
+    return blocks.sum(axis=(1, 3)) / (block * block)
+
+
+class PopulationTracker:
+    """
+    Records population, block density maps and pattern censuses while a rollout runs.
+    Only every k-th generation is analyzed to keep the cost bounded.
+
+    Attributes
+    ----------
+    every : int
+        Generations that are multiples of every are recorded.
+    block : int
+        Side length of the density map blocks.
+    track_census : bool
+        Whether to count patterns. The census is the most expensive measurement.
+    generations : list of int
+        Recorded generations.
+    populations : list of int
+        Number of living cells at each recorded generation.
+    density_maps : list of np.ndarray
+        Density map at each recorded generation.
+    censuses : list of dict
+        Pattern counts at each recorded generation.
+    """
+
+    def __init__(
+        self,
+        every: int = 10,
+        block: int = 8,
+        track_census: bool = True
+    ):
+        if every < 1:
+            raise ValueError(f"every must be a positive integer. Received {every}.")
+        if block < 1:
+            raise ValueError(f"block must be a positive integer. Received {block}.")
+
+        self.every: int = every
+        self.block: int = block
+        self.track_census: bool = track_census
+        self.generations: list[int] = []
+        self.populations: list[int] = []
+        self.density_maps: list[np.ndarray] = []
+        self.censuses: list[Dict[str, int]] = []
+
+
+    def observe(
+        self,
+        generation: int,
+        grid_state: np.ndarray
+    ) -> bool:
+        """
+        Records measurements of grid_state if generation is a multiple of every.
+        Returns whether the generation was recorded.
+        """
+
+        if generation % self.every != 0:
+            return False
+        self.generations.append(generation)
+        self.populations.append(int(grid_state.sum()))
+        self.density_maps.append(density_map(grid_state, self.block))
+        if self.track_census:
+            self.censuses.append(census(grid_state))
+        return True
+
+
+    def watch(
+        self,
+        frames: Iterable[Tuple[int, np.ndarray]]
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Passes a rollout through unchanged while observing every frame.
+
+        Examples
+        ----------
+        >>> tracker = PopulationTracker(every=50)
+        >>> for generation, grid_state in tracker.watch(ca.rollout(1000)):
+        ...     live.update(_render_state(grid_state))
+        """
+
+        for generation, grid_state in frames:
+            self.observe(generation, grid_state)
+            yield generation, grid_state
+
+
+    def census_counts(self) -> Dict[str, np.ndarray]:
+        """
+        Returns the count of each pattern over the recorded generations.
+        """
+
+        names: Tuple[str, ...] = tuple(PATTERNS.keys())
+        return {name: np.array([counts[name] for counts in self.censuses], dtype=int) for name in names}
+
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Returns the recorded measurements as arrays, with the density maps stacked over time.
+        """
+
+        return {
+            "generations": np.array(self.generations, dtype=int),
+            "populations": np.array(self.populations, dtype=int),
+            "density_maps": np.stack(self.density_maps) if self.density_maps else np.empty((0, 0, 0)),
+            "censuses": self.census_counts()
+        }
@@ -0,0 +1,58 @@
+import typer
+import subprocess
+import sys
+import os
+import time
+from typing import Annotated
+
+
+# Benchmarks run from the project root or the benchmarks folder, so run the imports from the root
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+app = typer.Typer()
+
+
+def _time_import(
+    statement: str,
+    repeats: int
+) -> float:
+    """
+    Helper function for main(). Returns the fastest wall clock seconds to run statement in a fresh interpreter.
+    """
+
+    timings: list[float] = []
+    for _ in range(repeats):
+        start_time: float = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], cwd=ROOT, check=True)
+        timings.append(time.perf_counter() - start_time)
+    return min(timings)
+
+
+@app.command()
+def main(
+    repeats: Annotated[int, typer.Option(help="Number of fresh interpreters to time for each case. The fastest is reported.")] = 5
+):
+    """
+    Compares the startup cost of main.py when running on a job server, which only loads the
+    CLI, renderer and client, with a local run, which also loads the simulation, SciPy and Numba.
+
+    Examples
+    ----------
+    $ python benchmarks/client_startup.py --repeats 5
+    """
+
+    # --- Timing Startup ---
+    timings: dict[str, float] = {
+        "interpreter only": _time_import("pass", repeats),
+        "main.py with --server": _time_import("import main", repeats),
+        "main.py local run": _time_import("import main, sim, checkpoint", repeats)
+    }
+
+    # --- Reporting Results ---
+    local: float = timings["main.py local run"]
+    for name, seconds in timings.items():
+        print(f"{name:<24} {seconds * 1000:8.0f} ms {local / seconds:6.2f}x")
+
+
+if __name__ == "__main__":
+    app()
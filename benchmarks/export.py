@@ -0,0 +1,64 @@
+import numpy as np
+import typer
+import time
+import sys
+import os
+import tempfile
+from typing import Annotated
+
+# Benchmarks run from the project root or the benchmarks folder, so make the root importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sim import CellularAutomaton
+from export import auto_cell_size, export_png_frames
+
+
+app = typer.Typer()
+
+
+@app.command()
+def main(
+    size: Annotated[int, typer.Option(help="Side length of the square grid.")] = 1000,
+    steps: Annotated[int, typer.Option(help="Number of steps in the rollout.")] = 50,
+    cell_size: Annotated[int | None, typer.Option(help="Side length in pixels of each cell. Defaults to auto_cell_size().")] = None,
+    engine: Annotated[str, typer.Option(help="Step engine, one of auto, numpy or numba.")] = "auto",
+    workers: Annotated[int | None, typer.Option(help="Number of encoding threads. Defaults to the number of CPUs.")] = None,
+    seed: Annotated[int, typer.Option(help="Seed for the random starting grid.")] = 42
+):
+    """
+    Compares simulating a rollout with simulating it and exporting every frame to PNG.
+    The export only keeps up with the simulation if the extra time is no more than the simulation time.
+
+    Examples
+    ----------
+    $ python benchmarks/export.py --size 1000 --steps 50
+    """
+
+    rng: np.random.Generator = np.random.default_rng(seed)
+    grid_state: np.ndarray = (rng.random((size, size)) < 0.3).astype(int)
+    cell_size: int = auto_cell_size(grid_state.shape) if cell_size is None else cell_size
+    # Step once first so kernel compilation or loading is not timed
+    CellularAutomaton(grid_state, engine=engine).step()
+    print(f"Grid {size}x{size}, {steps} steps, {engine} engine, cell size {cell_size}")
+
+    # --- Timing Simulation Alone ---
+    ca: CellularAutomaton = CellularAutomaton(grid_state, engine=engine)
+    start_time: float = time.perf_counter()
+    for _ in ca.rollout(steps):
+        pass
+    simulate_seconds: float = time.perf_counter() - start_time
+
+    # --- Timing Simulation With Export ---
+    ca: CellularAutomaton = CellularAutomaton(grid_state, engine=engine)
+    with tempfile.TemporaryDirectory() as directory:
+        start_time: float = time.perf_counter()
+        export_png_frames(ca.rollout(steps), directory, cell_size=cell_size, workers=workers)
+        export_seconds: float = time.perf_counter() - start_time - simulate_seconds
+
+    # --- Reporting Results ---
+    print(f"{'simulate':<10} {simulate_seconds:7.2f} s")
+    print(f"{'export':<10} {export_seconds:7.2f} s {export_seconds / simulate_seconds:6.2f}x simulation time")
+
+
+if __name__ == "__main__":
+    app()
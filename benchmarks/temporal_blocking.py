@@ -0,0 +1,83 @@
+import numpy as np
+import typer
+import time
+import sys
+import os
+from typing import Annotated, Callable
+
+# Benchmarks run from the project root or the benchmarks folder, so make the root importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sim import CellularAutomaton
+from kernels import make_rule_table, blocked_steps
+
+
+app = typer.Typer()
+
+
+def _time_per_step(
+    advance: Callable[[], None],
+    steps: int
+) -> float:
+    """
+    Helper function for main(). Returns the average wall clock seconds per step of advance().
+    """
+
+    start_time: float = time.perf_counter()
+    advance()
+    return (time.perf_counter() - start_time) / steps
+
+
+@app.command()
+def main(
+    size: Annotated[int, typer.Option(help="Side length of the square grid.")] = 8192,
+    steps: Annotated[int, typer.Option(help="Number of steps to time for each strategy.")] = 16,
+    tile_size: Annotated[int, typer.Option(help="Side length of the tiles.")] = 256,
+    block_steps: Annotated[int, typer.Option(help="Steps advanced per tile before writing back.")] = 8,
+    reference: Annotated[bool, typer.Option(help="Also time the reference step(). Needs ~40 bytes of memory per cell.")] = False,
+    seed: Annotated[int, typer.Option(help="Seed for the random starting grid.")] = 42
+):
+    """
+    Compares memory traffic bound stepping with temporal blocking on a large random grid.
+    The same uint8 kernel is timed on the whole grid at once (every intermediate array streams through memory),
+    on cache-sized tiles one step at a time (the grid is read and written once per step),
+    and on tiles advanced block_steps steps at a time (the grid is read and written once per block_steps steps).
+
+    Examples
+    ----------
+    $ python benchmarks/temporal_blocking.py --size 8192 --steps 16
+    """
+
+    rng: np.random.Generator = np.random.default_rng(seed)
+    grid_state: np.ndarray = (rng.random((size, size)) < 0.3).astype(int)
+    rule_table: np.ndarray = make_rule_table({2, 3}, {3})
+    print(f"Grid {size}x{size}, {steps} steps, tiles of {tile_size} cells")
+
+    # --- Timing Strategies ---
+    timings: dict[str, float] = {}
+    if reference:
+        ca: CellularAutomaton = CellularAutomaton(grid_state, engine="numpy", block_steps=1)
+        timings["reference step()"] = _time_per_step(lambda: ca.step(steps), steps)
+    timings["untiled, whole grid"] = _time_per_step(
+        lambda: blocked_steps(grid_state, rule_table, steps, tile_size=size, block_steps=1),
+        steps
+    )
+    timings["tiled, 1 step per tile"] = _time_per_step(
+        lambda: blocked_steps(grid_state, rule_table, steps, tile_size=tile_size, block_steps=1),
+        steps
+    )
+    timings[f"tiled, {block_steps} steps per tile"] = _time_per_step(
+        lambda: blocked_steps(grid_state, rule_table, steps, tile_size=tile_size, block_steps=block_steps),
+        steps
+    )
+
+    # --- Reporting Results ---
+    # Report speedups relative to streaming the whole grid every step
+    baseline: float = timings["untiled, whole grid"]
+    for name, seconds_per_step in timings.items():
+        cells_per_second: float = size * size / seconds_per_step
+        print(f"{name:<28} {seconds_per_step * 1000:9.1f} ms/step {cells_per_second / 1e6:9.1f} Mcells/s {baseline / seconds_per_step:6.2f}x")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,286 @@
+import numpy as np
+import json
+import os
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Tuple
+from numpy.random import Generator
+
+from sim import CellularAutomaton, SecondOrderCellularAutomaton
+from kernels import NUMBA_AVAILABLE
+
+
+# Version number stored in every checkpoint so the format can evolve without misreading old files
+# Version 2 added the cell data type and engine settings, version 1 files resume with the defaults
+_CHECKPOINT_VERSION: int = 2
+_SUPPORTED_VERSIONS: Tuple[int, ...] = (1, 2)
+# Bit generators that can be restored, looked up by the name stored in the checkpoint
+_BIT_GENERATORS: Dict[str, type] = {
+    bit_generator.__name__: bit_generator
+    for bit_generator in (np.random.PCG64, np.random.PCG64DXSM, np.random.MT19937, np.random.Philox, np.random.SFC64)
+}
+
+
+def _snapshot(
+    ca: CellularAutomaton
+) -> Dict[str, np.ndarray]:
+    """
+    Helper function for save_checkpoint() and Checkpointer.
+    Captures everything needed to resume the simulation as arrays independent of the CA,
+    so the CA can keep stepping while the snapshot is written elsewhere.
+
+    Parameters
+    ----------
+    ca : CellularAutomaton
+        Cellular automaton to capture.
+
+    Returns
+    ----------
+    snapshot : dict
+        Arrays to store in the checkpoint file.
+    """
+
+    # The format has no slot for the previous state, resuming without it would silently change the run
+    if isinstance(ca, SecondOrderCellularAutomaton):
+        raise TypeError("Checkpoints do not support SecondOrderCellularAutomaton.")
+
+    # Store the RNG as its bit generator name and state, None for synchronous runs without an RNG
+    rng_state: Dict[str, Any] | None = None if ca.rng is None else ca.rng.bit_generator.state
+    snapshot: Dict[str, np.ndarray] = {
+        "version": np.array(_CHECKPOINT_VERSION),
+        # Pack 8 cells per byte, the shape is stored separately to undo the padding
+        "grid_bits": np.packbits(ca.grid_state.astype(bool), axis=None),
+        "shape": np.array(ca.grid_state.shape),
+        "survive": np.array(sorted(ca.survive_set), dtype=int),
+        "birth": np.array(sorted(ca.birth_set), dtype=int),
+        "update_rate": np.array(ca.update_rate, dtype=float),
+        "generation": np.array(ca.generation),
+        # Execution settings, so planned runs resume with the same memory use and speed
+        "dtype": np.array(ca.grid_state.dtype.name),
+        "engine": np.array(ca.engine),
+        "tile_size": np.array(ca.tile_size),
+        "block_steps": np.array(ca.block_steps),
+        # Some bit generators keep arrays in their state, store them as lists for JSON
+        "rng_state": np.array(json.dumps(rng_state, default=lambda value: value.tolist()))
+    }
+    return snapshot
+
+
+def _fsync_directory(
+    directory: str
+) -> None:
+    """
+    Helper function for _write_snapshot().
+    Flushes a directory's entries to disk so a rename inside it survives a crash or power loss.
+    Windows cannot open directories and does not need this, so it is skipped there.
+    """
+
+    if os.name == "nt":
+        return
+    directory_descriptor: int = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(directory_descriptor)
+    finally:
+        os.close(directory_descriptor)
+
+
+def _write_snapshot(
+    snapshot: Dict[str, np.ndarray],
+    path: str
+) -> None:
+    """
+    Helper function for save_checkpoint() and Checkpointer.
+    Writes a snapshot to a temporary file next to path, then atomically renames it over path.
+    A crash mid-write therefore never leaves a truncated checkpoint behind.
+    """
+
+    directory: str = os.path.dirname(os.path.abspath(path))
+    file_descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=".checkpoint-", suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "wb") as temp_file:
+            np.savez_compressed(temp_file, **snapshot)
+            # Make sure the data is on disk before the rename makes it visible
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        # Remove the partial file and leave any previous checkpoint untouched
+        os.remove(temp_path)
+        raise
+    # The rename only lives in the directory entry until the directory itself is flushed
+    _fsync_directory(directory)
+
+
+def save_checkpoint(
+    ca: CellularAutomaton,
+    path: str
+) -> None:
+    """
+    Saves the full simulation state (grid, rule, update rate, generation, RNG state and execution settings) to path.
+    Restoring it with load_checkpoint() continues bit-identically to an uninterrupted run.
+
+    Parameters
+    ----------
+    ca : CellularAutomaton
+        Cellular automaton to save.
+    path : str
+        Destination file. Replaced atomically if it already exists.
+    """
+
+    _write_snapshot(_snapshot(ca), path)
+
+
+def load_checkpoint(
+    path: str
+) -> CellularAutomaton:
+    """
+    Restores a cellular automaton saved with save_checkpoint() or Checkpointer.
+
+    Parameters
+    ----------
+    path : str
+        Checkpoint file to load.
+
+    Returns
+    ----------
+    ca : CellularAutomaton
+        Cellular automaton in the exact state it was saved in.
+    """
+
+    with np.load(path) as checkpoint:
+        version: int = int(checkpoint["version"])
+        if version not in _SUPPORTED_VERSIONS:
+            raise ValueError(f"Unsupported checkpoint version {version}. Expected one of {', '.join(map(str, _SUPPORTED_VERSIONS))}.")
+
+        # Undo the bit packing, dropping the padding bits at the end
+        shape: tuple[int, ...] = tuple(checkpoint["shape"])
+        grid_state: np.ndarray = np.unpackbits(checkpoint["grid_bits"], count=int(np.prod(shape))).reshape(shape)
+
+        # Rebuild the RNG from the bit generator's name and state
+        # The name comes from the file, so only known bit generators are instantiated
+        rng_state: Dict[str, Any] | None = json.loads(str(checkpoint["rng_state"]))
+        rng: Generator | None = None
+        if rng_state is not None:
+            bit_generator_name: Any = rng_state.get("bit_generator")
+            if bit_generator_name not in _BIT_GENERATORS:
+                raise ValueError(f"Unsupported bit generator {bit_generator_name!r} in checkpoint. Expected one of {', '.join(_BIT_GENERATORS)}.")
+            bit_generator: np.random.BitGenerator = _BIT_GENERATORS[bit_generator_name]()
+            bit_generator.state = rng_state
+            rng: Generator = Generator(bit_generator)
+
+        # Restore the execution settings. Engines give identical results, so a run saved with Numba
+        # can resume on a machine without it
+        settings: Dict[str, Any] = {}
+        if version >= 2:
+            engine: str = str(checkpoint["engine"])
+            settings: Dict[str, Any] = {
+                "dtype": np.dtype(str(checkpoint["dtype"])),
+                "engine": "auto" if engine == "numba" and not NUMBA_AVAILABLE else engine,
+                "tile_size": int(checkpoint["tile_size"]),
+                "block_steps": int(checkpoint["block_steps"])
+            }
+
+        ca: CellularAutomaton = CellularAutomaton(
+            grid_state=grid_state,
+            survive_set=set(checkpoint["survive"].tolist()),
+            birth_set=set(checkpoint["birth"].tolist()),
+            update_rate=float(checkpoint["update_rate"]),
+            rng=rng,
+            **settings
+        )
+        ca.generation = int(checkpoint["generation"])
+
+    return ca
+
+
+class Checkpointer:
+    """
+    Periodically checkpoints a cellular automaton, writing files on a background thread.
+    The state is captured on the calling thread so stepping can continue during the write.
+    At most one write is in flight; a new checkpoint waits for the previous write to finish.
+
+    Attributes
+    ----------
+    path : str
+        Checkpoint file, replaced atomically on every save.
+    every : int
+        Number of generations between checkpoints.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        every: int = 100
+    ):
+        if every < 1:
+            raise ValueError(f"every must be a positive integer. Received {every}.")
+
+        self.path: str = path
+        self.every: int = every
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpoint")
+        self._pending: Future | None = None
+
+
+    def save(
+        self,
+        ca: CellularAutomaton
+    ) -> Future:
+        """
+        Captures the CA's state now and writes it in the background.
+        Raises any error from the previous write.
+        """
+
+        snapshot: Dict[str, np.ndarray] = _snapshot(ca)
+        # Wait for the previous write so writes stay ordered and snapshots do not pile up in memory
+        self.wait()
+        self._pending: Future = self._executor.submit(_write_snapshot, snapshot, self.path)
+        return self._pending
+
+
+    def maybe_save(
+        self,
+        ca: CellularAutomaton
+    ) -> None:
+        """
+        Saves a checkpoint if the CA's generation is a multiple of every.
+        Intended to be called after each step.
+        """
+
+        if ca.generation % self.every == 0:
+            self.save(ca)
+
+
+    def wait(self) -> None:
+        """
+        Blocks until the pending write, if any, has finished. Raises any error from the write.
+        """
+
+        if self._pending is not None:
+            self._pending.result()
+
+
+    def close(self) -> None:
+        """
+        Waits for the pending write and shuts down the background thread.
+        """
+
+        try:
+            self.wait()
+        finally:
+            self._executor.shutdown(wait=True)
+
+
+    def __enter__(self) -> "Checkpointer":
+        """
+        Returns the checkpointer itself for use in a with statement.
+        """
+
+        return self
+
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Closes the checkpointer, waiting for the pending write, whether or not the block raised.
+        """
+
+        self.close()
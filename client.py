@@ -0,0 +1,95 @@
+import numpy as np
+import json
+import urllib.error
+import urllib.request
+from http.client import HTTPResponse
+from typing import Any, Dict, Iterator, Tuple
+
+from frame_codec import decode_frame
+
+
+# Seconds to wait for the server to respond or send the next message
+TIMEOUT: float = 60.0
+
+
+class RemoteRun:
+    """
+    Simulation run executed by a job server started with server.py.
+    Only needs NumPy and the standard library, the simulation modules are never imported.
+    Iterating over it yields (generation, grid_state) pairs like CellularAutomaton.rollout(),
+    so it can be passed straight to render.render_frames().
+
+    Attributes
+    ----------
+    start_choice : str
+        Starting state used by the server, with "random_choice" resolved to the state that was picked.
+    shape : tuple of int
+        Shape of the grid.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        spec: Dict[str, Any]
+    ):
+        """
+        Submits a run spec to the server. Raises ValueError if the server rejects the spec
+        as invalid and RuntimeError if it is busy or unreachable.
+
+        Parameters
+        ----------
+        url : str
+            Base URL of the server, e.g. "http://127.0.0.1:8765".
+        spec : dict
+            Run spec with any of the fields steps, rule_string, start_choice, update_rate, seed and stride.
+        """
+
+        request: urllib.request.Request = urllib.request.Request(
+            url.rstrip("/") + "/run",
+            data=json.dumps(spec).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        try:
+            self._response: HTTPResponse = urllib.request.urlopen(request, timeout=TIMEOUT)
+        except urllib.error.HTTPError as e:
+            try:
+                message: str = json.loads(e.read())["error"]
+            except (ValueError, KeyError):
+                message: str = e.reason
+            if e.code == 400:
+                raise ValueError(message) from None
+            raise RuntimeError(f"Job server at {url} returned {e.code}: {message}") from None
+        except urllib.error.URLError as e:
+            raise RuntimeError(f"Could not reach job server at {url}: {e.reason}") from None
+
+        header: Dict[str, Any] = self._read_message()
+        self.start_choice: str = header["start_choice"]
+        self.shape: Tuple[int, int] = tuple(header["shape"])
+
+
+    def _read_message(self) -> Dict[str, Any]:
+        """
+        Helper function reading the next line of the streamed response.
+        """
+
+        line: bytes = self._response.readline()
+        if not line:
+            raise RuntimeError("Job server closed the connection before the run finished.")
+        message: Dict[str, Any] = json.loads(line)
+        if "error" in message:
+            raise RuntimeError(message["error"])
+        return message
+
+
+    def __iter__(self) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Yields (generation, grid_state) pairs as they arrive, closing the connection at the end.
+        """
+
+        with self._response:
+            while True:
+                message: Dict[str, Any] = self._read_message()
+                if message.get("done"):
+                    return
+                yield message["generation"], decode_frame(message["cells"], self.shape)
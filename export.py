@@ -0,0 +1,350 @@
+import numpy as np
+import os
+import shutil
+import struct
+import subprocess
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Tuple
+from numpy.typing import ArrayLike
+
+
+# Frames are upscaled so that each cell becomes a square block of pixels. By default the cell size is
+# picked from the board so images are about _AUTO_IMAGE_SIDE pixels across, between 1 and _MAX_AUTO_CELL_SIZE
+_AUTO_IMAGE_SIDE: int = 1024
+_MAX_AUTO_CELL_SIZE: int = 8
+# Number of frames encoded ahead of the producer per worker. Bounds memory when the producer is faster
+_PENDING_PER_WORKER: int = 2
+# Grayscale values for the raw video frames
+_DEAD_PIXEL: int = 0
+_ALIVE_PIXEL: int = 255
+
+
+def _iter_frames(
+    frames: Iterable[Any] | np.ndarray
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Helper function for the exporters.
+    Accepts a rollout (pairs of generation and grid state), a list of grid states, or a 3D array of stacked states.
+    Yields pairs of generation index and boolean grid state.
+    The boolean conversion copies the frame so later steps cannot change it while it is being encoded.
+    """
+
+    for index, frame in enumerate(frames):
+        # Rollouts yield (generation, grid_state), recorded trajectories only store the states
+        if isinstance(frame, tuple):
+            generation, grid_state = frame
+        else:
+            generation, grid_state = index, frame
+        grid_state: np.ndarray = np.array(grid_state, dtype=bool)
+        if grid_state.ndim != 2:
+            raise ValueError(f"Frames must be 2 dimensional. Received shape {grid_state.shape}.")
+        yield generation, grid_state
+
+
+def _ordered_map(
+    func: Callable[[int, np.ndarray], Any],
+    frames: Iterable[Any] | np.ndarray,
+    workers: int | None
+) -> Iterator[Any]:
+    """
+    Helper function for the exporters.
+    Applies func to each frame on a thread pool while frames keep being produced, yielding results in order.
+    The encoding work (NumPy and zlib) releases the GIL, so the threads run in parallel with the simulation.
+    """
+
+    workers: int = workers or os.cpu_count() or 1
+    max_pending: int = workers * _PENDING_PER_WORKER
+    pending: deque[Future] = deque()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="export") as executor:
+        for generation, grid_state in _iter_frames(frames):
+            pending.append(executor.submit(func, generation, grid_state))
+            # Wait on the oldest frame once enough are in flight so memory stays bounded
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def auto_cell_size(
+    shape: Tuple[int, int]
+) -> int:
+    """
+    Picks the cell size used by the exporters when none is given.
+    Small boards are enlarged to stay visible, boards of _AUTO_IMAGE_SIDE cells or more get one pixel per cell
+    so large exports are not dominated by encoding many times more pixels than there are cells.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        Shape of the grid.
+
+    Returns
+    ----------
+    cell_size : int
+        Side length in pixels of each cell, between 1 and _MAX_AUTO_CELL_SIZE, so the longer side of the image is about _AUTO_IMAGE_SIDE pixels.
+    """
+
+    return int(np.clip(_AUTO_IMAGE_SIDE // max(shape), 1, _MAX_AUTO_CELL_SIZE))
+
+
+def upscale(
+    grid_state: ArrayLike,
+    cell_size: int | None = None
+) -> np.ndarray:
+    """
+    Upscales a grid state so each cell becomes a cell_size x cell_size block of pixels.
+    Uses a broadcast view instead of drawing cells one at a time, so only the output is written.
+
+    Parameters
+    ----------
+    grid_state : array-like
+        Binary 2D grid state.
+    cell_size : int or None
+        Side length in pixels of each cell. If None, it is picked from the grid shape with auto_cell_size().
+
+    Returns
+    ----------
+    image : np.ndarray
+        Boolean image with shape (rows * cell_size, cols * cell_size), True for living cells.
+    """
+
+    grid_state: np.ndarray = np.asarray(grid_state, dtype=bool)
+    if cell_size is None:
+        cell_size: int = auto_cell_size(grid_state.shape)
+    if cell_size < 1:
+        raise ValueError(f"cell_size must be a positive integer. Received {cell_size}.")
+    # One pixel per cell needs no copy
+    if cell_size == 1:
+        return grid_state
+    num_rows, num_cols = grid_state.shape
+    # Broadcast each cell over a new axis after its row and after its column, then merge the axes
+    blocks: np.ndarray = np.broadcast_to(
+        grid_state[:, None, :, None],
+        (num_rows, cell_size, num_cols, cell_size)
+    )
+    return blocks.reshape(num_rows * cell_size, num_cols * cell_size)
+
+
+def _png_chunk(
+    chunk_type: bytes,
+    data: bytes
+) -> bytes:
+    """
+    Helper function for encode_png(). Wraps data in a PNG chunk with length and checksum.
+    """
+
+    return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", zlib.crc32(chunk_type + data))
+
+
+def encode_png(
+    image: ArrayLike,
+    compress_level: int = 1
+) -> bytes:
+    """
+    Encodes a binary image as a 1-bit grayscale PNG using only the standard library.
+    Living cells are white and dead cells are black.
+
+    Parameters
+    ----------
+    image : array-like
+        Binary 2D image, e.g. the output of upscale().
+    compress_level : int
+        zlib compression level from 0 to 9. Binary images compress well even at low levels.
+        Run-length matching is used at every level, it compresses cell patterns about as well
+        as the default strategy and is several times faster on busy frames.
+
+    Returns
+    ----------
+    png : bytes
+        Contents of the PNG file.
+    """
+
+    image: np.ndarray = np.asarray(image, dtype=bool)
+    height, width = image.shape
+    # Pack 8 pixels per byte and prefix every row with filter type 0 (no filtering)
+    packed_rows: np.ndarray = np.packbits(image, axis=1)
+    scanlines: np.ndarray = np.zeros((height, packed_rows.shape[1] + 1), dtype=np.uint8)
+    scanlines[:, 1:] = packed_rows
+
+    compressor: Any = zlib.compressobj(compress_level, zlib.DEFLATED, zlib.MAX_WBITS, strategy=zlib.Z_RLE)
+
+    # Header fields: width, height, bit depth 1, color type 0 (grayscale), default compression, filter and interlacing
+    header: bytes = struct.pack(">IIBBBBB", width, height, 1, 0, 0, 0, 0)
+    return b"".join([
+        b"\x89PNG\r\n\x1a\n",
+        _png_chunk(b"IHDR", header),
+        _png_chunk(b"IDAT", compressor.compress(scanlines.tobytes()) + compressor.flush()),
+        _png_chunk(b"IEND", b"")
+    ])
+
+
+def export_png_frames(
+    frames: Iterable[Any] | np.ndarray,
+    directory: str,
+    cell_size: int | None = None,
+    prefix: str = "frame",
+    workers: int | None = None
+) -> list[str]:
+    """
+    Writes every frame of a rollout or recorded trajectory to its own PNG file.
+
+    Parameters
+    ----------
+    frames : iterable or np.ndarray
+        Rollout from CellularAutomaton.rollout(), list of grid states, or 3D array of stacked states.
+    directory : str
+        Directory to write the frames to. Created if it does not exist.
+    cell_size : int or None
+        Side length in pixels of each cell. If None, it is picked from the grid shape with auto_cell_size().
+    prefix : str
+        File names are <prefix>_<generation>.png.
+    workers : int or None
+        Number of encoding threads. If None, uses the number of CPUs.
+
+    Returns
+    ----------
+    paths : list of str
+        Paths of the written files in frame order.
+
+    Examples
+    ----------
+    >>> export_png_frames(ca.rollout(1000, stride=10), "frames/")
+    """
+
+    os.makedirs(directory, exist_ok=True)
+
+    def write_frame(generation: int, grid_state: np.ndarray) -> str:
+        """
+        Helper function for export_png_frames(). Encodes one frame and writes it, returning its path.
+        """
+
+        path: str = os.path.join(directory, f"{prefix}_{generation:06d}.png")
+        with open(path, "wb") as png_file:
+            png_file.write(encode_png(upscale(grid_state, cell_size)))
+        return path
+
+    return list(_ordered_map(write_frame, frames, workers))
+
+
+def export_gif(
+    frames: Iterable[Any] | np.ndarray,
+    path: str,
+    cell_size: int | None = None,
+    milliseconds_per_frame: int = 100,
+    workers: int | None = None
+) -> None:
+    """
+    Writes a rollout or recorded trajectory to a looping animated GIF. Requires Pillow.
+    GIFs hold every frame in memory while encoding, so prefer export_video() for long or large runs.
+
+    Parameters
+    ----------
+    frames : iterable or np.ndarray
+        Rollout from CellularAutomaton.rollout(), list of grid states, or 3D array of stacked states.
+    path : str
+        Destination GIF file.
+    cell_size : int or None
+        Side length in pixels of each cell. If None, it is picked from the grid shape with auto_cell_size().
+    milliseconds_per_frame : int
+        Display time of each frame.
+    workers : int or None
+        Number of upscaling threads. If None, uses the number of CPUs.
+    """
+
+    try:
+        from PIL import Image
+    except ImportError as e:
+        raise ImportError("export_gif() requires Pillow. Install it with `pip install pillow`.") from e
+
+    def to_image(generation: int, grid_state: np.ndarray) -> "Image.Image":
+        """
+        Helper function for export_gif(). Upscales one frame into a Pillow image.
+        """
+
+        return Image.fromarray(upscale(grid_state, cell_size))
+
+    images: list["Image.Image"] = list(_ordered_map(to_image, frames, workers))
+    if not images:
+        raise ValueError("Cannot export a GIF without any frames.")
+    images[0].save(
+        path,
+        save_all=True,
+        append_images=images[1:],
+        duration=milliseconds_per_frame,
+        loop=0
+    )
+
+
+def export_video(
+    frames: Iterable[Any] | np.ndarray,
+    path: str,
+    cell_size: int | None = None,
+    frames_per_second: int = 30,
+    workers: int | None = None,
+    ffmpeg: str = "ffmpeg"
+) -> None:
+    """
+    Pipes raw grayscale frames to a local ffmpeg, which encodes them into path.
+    The container and codec are chosen by ffmpeg from the file extension, e.g. .mp4 or .webm.
+
+    Parameters
+    ----------
+    frames : iterable or np.ndarray
+        Rollout from CellularAutomaton.rollout(), list of grid states, or 3D array of stacked states.
+    path : str
+        Destination video file.
+    cell_size : int or None
+        Side length in pixels of each cell. If None, it is picked from the grid shape with auto_cell_size().
+    frames_per_second : int
+        Frame rate of the video.
+    workers : int or None
+        Number of upscaling threads. If None, uses the number of CPUs.
+    ffmpeg : str
+        Name or path of the ffmpeg executable.
+    """
+
+    ffmpeg_path: str | None = shutil.which(ffmpeg)
+    if ffmpeg_path is None:
+        raise FileNotFoundError(f"Could not find {ffmpeg!r}. Install ffmpeg or use export_png_frames() instead.")
+
+    def to_pixels(generation: int, grid_state: np.ndarray) -> np.ndarray:
+        """
+        Helper function for export_video(). Upscales one frame into 8-bit grayscale pixels.
+        """
+
+        return np.where(upscale(grid_state, cell_size), _ALIVE_PIXEL, _DEAD_PIXEL).astype(np.uint8)
+
+    process: subprocess.Popen | None = None
+    frame_shape: tuple[int, int] | None = None
+    try:
+        for pixels in _ordered_map(to_pixels, frames, workers):
+            # Start ffmpeg once the frame size is known from the first frame
+            if process is None:
+                frame_shape = pixels.shape
+                process = subprocess.Popen(
+                    [
+                        ffmpeg_path, "-y", "-loglevel", "error",
+                        "-f", "rawvideo", "-pix_fmt", "gray",
+                        "-s", f"{frame_shape[1]}x{frame_shape[0]}",
+                        "-r", str(frames_per_second),
+                        "-i", "-",
+                        # Most codecs need even dimensions, pad with a dead row/column if needed
+                        "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+                        "-pix_fmt", "yuv420p",
+                        path
+                    ],
+                    stdin=subprocess.PIPE
+                )
+            elif pixels.shape != frame_shape:
+                raise ValueError(f"All frames must have the same shape. Expected {frame_shape}, received {pixels.shape}.")
+            process.stdin.write(pixels.tobytes())
+    finally:
+        if process is not None:
+            process.stdin.close()
+            return_code: int = process.wait()
+    if process is None:
+        raise ValueError("Cannot export a video without any frames.")
+    if return_code != 0:
+        raise RuntimeError(f"ffmpeg exited with code {return_code} while writing {path}.")
@@ -0,0 +1,47 @@
+import numpy as np
+import base64
+
+
+def encode_frame(
+    grid_state: np.ndarray
+) -> str:
+    """
+    Bit-packs a grid state into a base64 string for sending over the wire.
+    Kept free of the simulation modules so job server clients start quickly.
+
+    Parameters
+    ----------
+    grid_state : np.ndarray
+        Binary 2D grid state.
+
+    Returns
+    ----------
+    cells : str
+        Grid state packed 8 cells per byte in row-major order, base64 encoded.
+    """
+
+    return base64.b64encode(np.packbits(grid_state.astype(bool), axis=None).tobytes()).decode("ascii")
+
+
+def decode_frame(
+    cells: str,
+    shape: tuple[int, int]
+) -> np.ndarray:
+    """
+    Reverses encode_frame().
+
+    Parameters
+    ----------
+    cells : str
+        Encoded grid state from encode_frame().
+    shape : tuple of int
+        Shape of the grid, which is not stored in the encoding.
+
+    Returns
+    ----------
+    grid_state : np.ndarray
+        Integer grid state.
+    """
+
+    packed: np.ndarray = np.frombuffer(base64.b64decode(cells), dtype=np.uint8)
+    return np.unpackbits(packed, count=shape[0] * shape[1]).reshape(shape).astype(int)
@@ -1,13 +1,16 @@
 import numpy as np
 import typer
-import re
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated
 from numpy.random import Generator
 
-from sim import CellularAutomaton
-from render import render_rollout
+from render import render_frames, render_rollout, Viewport
 from starting_states import get_start, start_options_desc
 from validation import validate_inputs
+from rules import Rule, parse_rule
+from client import RemoteRun
+# The simulation modules are imported where they are used, so runs on a job server skip loading SciPy and Numba
+if TYPE_CHECKING:
+    from sim import CellularAutomaton
 
 
 # Following standard typer app pattern for shell parameter parsing and --help customization
@@ -60,7 +63,71 @@ def main(
             "--sec-per-step", "-sps",
             help="Number of seconds between steps of animation. Smaller values speed up the simulation."
         )
-    ] = 0.3
+    ] = 0.3,
+    checkpoint_path: Annotated[
+        str | None,
+        typer.Option(
+            "--checkpoint", "-cp",
+            help="File to periodically save the full simulation state to, including the RNG, so long runs can be resumed with --resume."
+        )
+    ] = None,
+    checkpoint_every: Annotated[
+        int,
+        typer.Option(
+            "--checkpoint-every", "-cpe",
+            help="Number of steps between checkpoints. Only used with --checkpoint."
+        )
+    ] = 100,
+    resume_path: Annotated[
+        str | None,
+        typer.Option(
+            "--resume",
+            help="Checkpoint file to resume from. The rule, starting state, update rate and seed are restored from the checkpoint and --steps more steps are run."
+        )
+    ] = None,
+    display: Annotated[
+        str,
+        typer.Option(
+            "--display", "-d",
+            help="How cells are drawn. \"grid\" draws every cell with separators. \"half\" packs 2 cells into each character with half blocks and \"braille\" packs 8 cells into each braille character, fitting much larger grids in the terminal."
+        )
+    ] = "grid",
+    zoom: Annotated[
+        int | None,
+        typer.Option(
+            "--zoom", "-z",
+            help="Downsampling factor. Each zoom x zoom block of cells is shown as one alive pixel if any cell in it is alive. By default grids are zoomed out to fit the terminal, except with --display grid."
+        )
+    ] = None,
+    server_url: Annotated[
+        str | None,
+        typer.Option(
+            "--server",
+            envvar="CA_SIM_SERVER",
+            help="URL of a job server started with server.py, e.g. http://127.0.0.1:8765. The simulation runs on the server's warm workers and frames are streamed back. Can also be set with the CA_SIM_SERVER environment variable."
+        )
+    ] = None,
+    dry_run: Annotated[
+        bool,
+        typer.Option(
+            "--dry-run",
+            help="Print the execution plan (strategy, cell data type, tiling and threads) with its memory and time estimates, then exit without running. The first use calibrates this machine for a few seconds and caches the result."
+        )
+    ] = False,
+    memory_cap: Annotated[
+        int | None,
+        typer.Option(
+            "--memory-cap",
+            help="Memory budget in MiB. The planner picks the fastest strategy estimated to fit, using less memory per cell if needed."
+        )
+    ] = None,
+    threads: Annotated[
+        int | None,
+        typer.Option(
+            "--threads",
+            help="Maximum number of threads the planner may use. Defaults to all threads available to Numba."
+        )
+    ] = None
 ):
     """
     Runs discrete cellular automaton simulation in the terminal. 
@@ -83,12 +150,35 @@ def main(
         For asychronous CA. Seed to fix randomization for reproducibility. If None rng will not be fixed.
     seconds_per_step : float
         Number of seconds between steps of the animation.
+    checkpoint_path : str or None
+        File to periodically save resumable simulation state to. If None no checkpoints are saved.
+    checkpoint_every : int
+        Number of steps between checkpoints.
+    resume_path : str or None
+        Checkpoint file to continue a previous run from. Overrides the rule, start, update rate and seed.
+    display : str
+        Display mode, one of "grid", "half" or "braille".
+    zoom : int or None
+        Side length of the blocks of cells pooled into one pixel. If None, fits the grid to the terminal.
+    server_url : str or None
+        Job server to run the simulation on. If None the simulation runs in this process.
+    dry_run : bool
+        If True, print the execution plan and exit without running.
+    memory_cap : int or None
+        Memory budget in MiB for the execution plan. If None, memory does not limit the plan.
+    threads : int or None
+        Maximum number of threads for the execution plan. If None, all threads available to Numba.
 
     Examples
     ----------
     $ python main.py -s 100 --rule S23B3 --start gliders -sps 0.1
     $ python main.py -s 100 -r S23B3 --start block -ur 0.6 -sd 42 -sps 0.05
     $ python main.py -s 100 -r S23B3 --start oscillator -ur 1.0 -sps 0.1
+    $ python main.py -s 10000 --start gliders -ur 0.6 -sd 42 -cp run.ckpt -cpe 500
+    $ python main.py -s 10000 --resume run.ckpt -cp run.ckpt -cpe 500
+    $ python main.py -s 1000 --start randomize -d braille -sps 0.02
+    $ python main.py -s 100 --start gliders -sps 0.1 --server http://127.0.0.1:8765
+    $ python main.py -s 1000 --start randomize --memory-cap 4096 --threads 4 --dry-run
     """
 
     # --- Input Error Handling ---
@@ -98,15 +188,49 @@ def main(
         start_choice,
         update_rate,
         seed,
-        seconds_per_step  
+        seconds_per_step,
+        checkpoint_every,
+        display,
+        zoom,
+        memory_cap,
+        threads
     )
+    planned: bool = dry_run or memory_cap is not None or threads is not None
+
+    # --- Running on Job Server ---
+    # The server holds the simulation state, so there is nothing local to checkpoint
+    if server_url is not None:
+        if checkpoint_path is not None or resume_path is not None:
+            raise ValueError("--checkpoint and --resume cannot be used with --server.")
+        if planned:
+            raise ValueError("--dry-run, --memory-cap and --threads cannot be used with --server.")
+        run: RemoteRun = RemoteRun(server_url, {
+            "steps": steps,
+            "rule_string": rule_string,
+            "start_choice": start_choice,
+            "update_rate": update_rate,
+            "seed": seed
+        })
+        render_frames(run, seconds_per_step, _viewport(display, zoom, run.shape))
+        return
+
+    from sim import CellularAutomaton
+    from checkpoint import load_checkpoint
+
+    # --- Resuming From Checkpoint ---
+    # The checkpoint stores the rule, grid state and RNG so no other setup is needed
+    if resume_path is not None:
+        if planned:
+            raise ValueError("--dry-run, --memory-cap and --threads cannot be used with --resume.")
+        ca: CellularAutomaton = load_checkpoint(resume_path)
+        _animate(ca, steps, seconds_per_step, checkpoint_path, checkpoint_every, display, zoom)
+        return
 
     # --- Converting Rule String to Sets of Integers ---
-    # Extract substrings for S and B
-    survive_str, birth_str = re.findall(string=rule_string, pattern=r"^S(\d*)B(\d*)$")[0]
-    # Convert to sets of integers
-    survive_set: set = set(map(int, survive_str))
-    birth_set: set = set(map(int, birth_str))
+    # Parsed rules are cached, validation above already parsed this one
+    rule: Rule = parse_rule(rule_string)
+    survive_set: set = set(rule.survive_set)
+    birth_set: set = set(rule.birth_set)
 
     # --- Retrieving Starting State ---
     start: np.ndarray = get_start(start_choice)
@@ -114,20 +238,82 @@ def main(
     # --- Initializing CA with Starting State and Rule Sets ---
     # Initialize RNG for determinism with asynchonous CA
     rng: Generator = np.random.default_rng(seed)
-    ca: CellularAutomaton = CellularAutomaton(
-        grid_state=start,
-        survive_set=survive_set,
-        birth_set=birth_set,
-        update_rate=update_rate,
-        rng=rng
-    )
+    if planned:
+        # The planner picks the engine, cell data type, tiling and threads from a cached calibration
+        from planner import Plan, load_calibration, plan_run
+        plan: Plan = plan_run(
+            start.shape,
+            steps,
+            update_rate,
+            memory_cap * 2**20 if memory_cap is not None else None,
+            threads,
+            load_calibration()
+        )
+        if dry_run:
+            print(plan.report())
+            return
+        ca: CellularAutomaton = plan.build(start, survive_set, birth_set, rng)
+    else:
+        ca: CellularAutomaton = CellularAutomaton(
+            grid_state=start,
+            survive_set=survive_set,
+            birth_set=birth_set,
+            update_rate=update_rate,
+            rng=rng
+        )
 
     # --- Animating Rollout ---
-    render_rollout(
-        ca=ca, 
-        steps=steps, 
-        seconds_per_step=seconds_per_step
-    )
+    _animate(ca, steps, seconds_per_step, checkpoint_path, checkpoint_every, display, zoom)
+
+
+def _viewport(
+    display: str,
+    zoom: int | None,
+    grid_shape: tuple[int, int]
+) -> Viewport | None:
+    """
+    Helper function for main() and _animate().
+    Returns the viewport for the display options, or None to draw the full grid.
+    """
+
+    # The full grid display is kept unless a dense display or zoom is requested
+    if display == "grid" and zoom is None:
+        return None
+    return Viewport.for_terminal(mode=display, zoom=zoom, grid_shape=grid_shape)
+
+
+def _animate(
+    ca: "CellularAutomaton",
+    steps: int,
+    seconds_per_step: float,
+    checkpoint_path: str | None,
+    checkpoint_every: int,
+    display: str,
+    zoom: int | None
+) -> None:
+    """
+    Helper function for main().
+    Animates the rollout, checkpointing in the background if a checkpoint path is given.
+    """
+
+    viewport: Viewport | None = _viewport(display, zoom, ca.grid_state.shape)
+
+    if checkpoint_path is None:
+        render_rollout(ca=ca, steps=steps, seconds_per_step=seconds_per_step, viewport=viewport)
+        return
+
+    from checkpoint import Checkpointer
+
+    with Checkpointer(checkpoint_path, every=checkpoint_every) as checkpointer:
+        render_rollout(
+            ca=ca, 
+            steps=steps, 
+            seconds_per_step=seconds_per_step,
+            checkpointer=checkpointer,
+            viewport=viewport
+        )
+        # Save the final state so the run can be extended later
+        checkpointer.save(ca)
 
 
 if __name__ == "__main__":
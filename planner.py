@@ -0,0 +1,466 @@
+import numpy as np
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from functools import partial
+from numpy.random import Generator
+from typing import Any, Callable, Dict, Tuple
+from numpy.typing import ArrayLike
+
+from sim import CellularAutomaton
+from kernels import NUMBA_AVAILABLE, DEFAULT_BLOCK_STEPS
+if NUMBA_AVAILABLE:
+    import numba
+
+
+# Bump when the measurements change so stale calibration files are redone
+CALIBRATION_VERSION: int = 2
+DEFAULT_CALIBRATION_PATH: str = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "discrete-ca-sim",
+    "calibration.json"
+)
+# Calibration runs every strategy on a small random grid, large enough that per-step overheads are amortized
+CALIBRATION_SIZE: int = 384
+CALIBRATION_STEPS: int = 8
+# Candidate tile sizes for temporal blocking, the fastest measured one is planned
+TILE_SIZES: Tuple[int, ...] = (64, 128, 256)
+# Cell data types the planner can choose between
+DTYPES: Dict[str, np.dtype] = {"uint8": np.dtype(np.uint8), "int64": np.dtype(np.int64)}
+# Step strategies. "numpy-blocked" is the NumPy engine with temporal blocking, only used for synchronous updates
+STRATEGIES: Tuple[str, ...] = ("numba", "numpy-blocked", "numpy")
+
+
+def _fingerprint() -> Dict[str, Any]:
+    """
+    Helper function for calibrate() and load_calibration().
+    Describes the machine and libraries, a calibration is only reused on a matching fingerprint.
+    """
+
+    return {
+        "version": CALIBRATION_VERSION,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "numba": numba.__version__ if NUMBA_AVAILABLE else None,
+        # The all threads measurement depends on NUMBA_NUM_THREADS, which can differ between runs
+        "numba_threads": _max_threads()
+    }
+
+
+def _max_threads() -> int:
+    """
+    Helper function returning the largest number of threads the Numba engine can use.
+    """
+
+    return numba.config.NUMBA_NUM_THREADS if NUMBA_AVAILABLE else 1
+
+
+def _measure(
+    make_ca: Callable[[], CellularAutomaton],
+    input_bytes: int,
+    steps: int
+) -> Dict[str, float]:
+    """
+    Helper function for calibrate().
+    Measures the peak memory and throughput of building and stepping a cellular automaton.
+
+    Returns
+    ----------
+    measurement : dict
+        bytes_per_cell, the input grid plus the peak of allocations while building and stepping, and cells_per_second.
+    """
+
+    # Build and step once untimed so Numba kernels are loaded and caches are warm
+    ca: CellularAutomaton = make_ca()
+    ca.step()
+    cells: int = ca.grid_state.size
+
+    # NumPy reports its allocations to tracemalloc. The input grid is allocated by the caller before
+    # the automaton is built and stays alive during the run, so it is counted on top of the traced peak
+    del ca
+    tracemalloc.start()
+    try:
+        ca: CellularAutomaton = make_ca()
+        ca.step(steps + 1)
+        peak_bytes: int = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    # Time separately since tracing slows allocation down
+    ca: CellularAutomaton = make_ca()
+    ca.step()
+    start_time: float = time.perf_counter()
+    ca.step(steps)
+    seconds: float = time.perf_counter() - start_time
+
+    return {
+        "bytes_per_cell": (input_bytes + peak_bytes) / cells,
+        "cells_per_second": cells * steps / seconds
+    }
+
+
+def _calibration_ca(
+    grid_state: np.ndarray,
+    dtype: np.dtype,
+    update_rate: float,
+    engine: str,
+    tile_size: int = TILE_SIZES[-1],
+    block_steps: int = 1
+) -> CellularAutomaton:
+    """
+    Helper function for calibrate(). Builds the automaton measured for one configuration, with a fixed seed.
+    """
+
+    return CellularAutomaton(
+        grid_state,
+        update_rate=update_rate,
+        rng=np.random.default_rng(0),
+        engine=engine,
+        tile_size=tile_size,
+        block_steps=block_steps,
+        dtype=dtype
+    )
+
+
+def calibrate(
+    size: int = CALIBRATION_SIZE,
+    steps: int = CALIBRATION_STEPS
+) -> Dict[str, Any]:
+    """
+    Measures memory use and throughput of every strategy and cell data type on this machine,
+    for synchronous and asynchronous updating. Takes a few seconds.
+
+    Parameters
+    ----------
+    size : int
+        Side length of the square calibration grid.
+    steps : int
+        Number of steps timed for each measurement.
+
+    Returns
+    ----------
+    calibration : dict
+        JSON serializable measurements, keyed by "<strategy>/<dtype>/<sync or async>".
+    """
+
+    grid_state: np.ndarray = (np.random.default_rng(0).random((size, size)) < 0.3).astype(int)
+    measurements: Dict[str, Dict[str, Any]] = {}
+    for dtype_name, dtype in DTYPES.items():
+        for mode, update_rate in (("sync", 1.0), ("async", 0.5)):
+            make_ca: Callable[..., CellularAutomaton] = partial(_calibration_ca, grid_state, dtype, update_rate)
+            measurements[f"numpy/{dtype_name}/{mode}"] = _measure(partial(make_ca, "numpy"), grid_state.nbytes, steps)
+
+            # Temporal blocking only applies to synchronous updates, keep the fastest tile size
+            if mode == "sync":
+                tile_measurements: list[Dict[str, Any]] = [
+                    {**_measure(partial(make_ca, "numpy", tile_size, DEFAULT_BLOCK_STEPS), grid_state.nbytes, steps), "tile_size": tile_size}
+                    for tile_size in TILE_SIZES
+                ]
+                measurements[f"numpy-blocked/{dtype_name}/{mode}"] = max(tile_measurements, key=lambda m: m["cells_per_second"])
+
+            # Numba is timed on one thread and on all threads, planned thread counts are interpolated
+            if NUMBA_AVAILABLE:
+                default_threads: int = numba.get_num_threads()
+                try:
+                    numba.set_num_threads(1)
+                    single_thread: Dict[str, float] = _measure(partial(make_ca, "numba"), grid_state.nbytes, steps)
+                    all_threads: Dict[str, float] = single_thread
+                    if _max_threads() > 1:
+                        numba.set_num_threads(_max_threads())
+                        all_threads: Dict[str, float] = _measure(partial(make_ca, "numba"), grid_state.nbytes, steps)
+                finally:
+                    numba.set_num_threads(default_threads)
+                measurements[f"numba/{dtype_name}/{mode}"] = {
+                    "bytes_per_cell": max(single_thread["bytes_per_cell"], all_threads["bytes_per_cell"]),
+                    "cells_per_second": single_thread["cells_per_second"],
+                    "cells_per_second_all_threads": all_threads["cells_per_second"],
+                    "max_threads": _max_threads()
+                }
+
+    return {
+        "fingerprint": _fingerprint(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "grid_size": size,
+        "measurements": measurements
+    }
+
+
+def load_calibration(
+    path: str = DEFAULT_CALIBRATION_PATH,
+    recalibrate: bool = False
+) -> Dict[str, Any]:
+    """
+    Loads the cached calibration, calibrating and caching it first if the file is missing,
+    unreadable, or was measured on a different machine or library version.
+
+    Parameters
+    ----------
+    path : str
+        Calibration cache file.
+    recalibrate : bool
+        If True, always measure again and overwrite the cache.
+
+    Returns
+    ----------
+    calibration : dict
+        Measurements from calibrate(), plus the path they are cached at.
+    """
+
+    if not recalibrate:
+        try:
+            with open(path) as calibration_file:
+                calibration: Dict[str, Any] = json.load(calibration_file)
+            if calibration.get("fingerprint") == _fingerprint():
+                return {**calibration, "path": path}
+        except (OSError, ValueError):
+            pass
+
+    calibration: Dict[str, Any] = calibrate()
+    # Write to a temporary file and rename so concurrent runs never read a partial file
+    directory: str = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    file_descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=".calibration-", suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "w") as temp_file:
+            json.dump(calibration, temp_file, indent=2)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return {**calibration, "path": path}
+
+
+def _format_bytes(
+    num_bytes: float
+) -> str:
+    """
+    Helper function for Plan.report(). Formats a byte count with a binary unit, e.g. "1.5 GiB".
+    """
+
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if num_bytes < 1024:
+            return f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} TiB"
+
+
+class Plan:
+    """
+    Execution plan chosen by plan_run(): the strategy, cell data type, tiling and number of threads,
+    with the estimates of every candidate that was considered.
+
+    Attributes
+    ----------
+    engine : str
+        Engine passed to CellularAutomaton, "numpy" or "numba".
+    strategy : str
+        One of STRATEGIES.
+    dtype : np.dtype
+        Cell data type.
+    tile_size : int
+        Tile side length for temporal blocking.
+    block_steps : int
+        Steps per tile, 1 unless the strategy is "numpy-blocked".
+    threads : int
+        Number of threads the Numba engine runs on, 1 for NumPy strategies.
+    estimated_bytes : float
+        Estimated peak memory of the grid and stepping.
+    estimated_seconds : float
+        Estimated time to apply all steps.
+    candidates : list of dict
+        Every strategy and data type considered, with estimates and the reason it was rejected, if any.
+    """
+
+    def __init__(
+        self,
+        shape: Tuple[int, int],
+        steps: int,
+        update_rate: float,
+        memory_cap: float | None,
+        thread_budget: int,
+        calibration: Dict[str, Any],
+        candidates: list[Dict[str, Any]],
+        chosen: Dict[str, Any]
+    ):
+        self.shape: Tuple[int, int] = shape
+        self.steps: int = steps
+        self.update_rate: float = update_rate
+        self.memory_cap: float | None = memory_cap
+        self.thread_budget: int = thread_budget
+        self.calibration: Dict[str, Any] = calibration
+        self.candidates: list[Dict[str, Any]] = candidates
+
+        self.strategy: str = chosen["strategy"]
+        self.engine: str = "numba" if self.strategy == "numba" else "numpy"
+        self.dtype: np.dtype = DTYPES[chosen["dtype"]]
+        self.tile_size: int = chosen.get("tile_size", TILE_SIZES[-1])
+        self.block_steps: int = DEFAULT_BLOCK_STEPS if self.strategy == "numpy-blocked" else 1
+        self.threads: int = chosen["threads"]
+        self.estimated_bytes: float = chosen["bytes"]
+        self.estimated_seconds: float = chosen["seconds"]
+
+
+    def build(
+        self,
+        grid_state: ArrayLike,
+        survive_set: set = {2, 3},
+        birth_set: set = {3},
+        rng: Generator | None = None
+    ) -> CellularAutomaton:
+        """
+        Builds a cellular automaton configured by the plan.
+        Sets Numba's thread count for the whole process when the plan uses the Numba engine.
+        """
+
+        if self.engine == "numba":
+            numba.set_num_threads(self.threads)
+        return CellularAutomaton(
+            grid_state=grid_state,
+            survive_set=survive_set,
+            birth_set=birth_set,
+            update_rate=self.update_rate,
+            rng=rng,
+            engine=self.engine,
+            tile_size=self.tile_size,
+            block_steps=self.block_steps,
+            dtype=self.dtype
+        )
+
+
+    def report(self) -> str:
+        """
+        Explains the plan: the run, the limits, every candidate's estimates and why the plan was chosen.
+        """
+
+        num_rows, num_cols = self.shape
+        updating: str = "synchronous" if np.isclose(self.update_rate, 1.0) else f"asynchronous (update rate {self.update_rate})"
+        memory_cap: str = "none" if self.memory_cap is None else _format_bytes(self.memory_cap)
+        fingerprint: Dict[str, Any] = self.calibration["fingerprint"]
+        lines: list[str] = [
+            f"Plan for a {num_rows}x{num_cols} grid ({num_rows * num_cols:,} cells), {self.steps} steps, {updating} updating",
+            f"Memory cap: {memory_cap}. Thread budget: {self.thread_budget}.",
+            f"Calibration: {self.calibration.get('path', 'not cached')}, measured {self.calibration['created']} on {fingerprint['machine']} with {fingerprint['cpu_count']} CPUs",
+            "",
+            f"{'strategy':<15}{'dtype':<8}{'threads':>8}{'memory':>13}{'est. time':>12}  notes"
+        ]
+        for candidate in self.candidates:
+            chosen: bool = (candidate["strategy"], candidate["dtype"]) == (self.strategy, self.dtype.name)
+            notes: str = "chosen" if chosen else candidate["rejected"] or ""
+            lines.append(
+                f"{candidate['strategy']:<15}{candidate['dtype']:<8}{candidate['threads']:>8}"
+                f"{_format_bytes(candidate['bytes']):>13}{candidate['seconds']:>11.2f}s  {notes}"
+            )
+
+        tiling: str = f", {self.tile_size}x{self.tile_size} tiles advanced {self.block_steps} steps at a time" if self.strategy == "numpy-blocked" else ""
+        limit: str = "that fits in the memory cap" if self.memory_cap is not None else "(no memory cap given)"
+        lines += [
+            "",
+            f"Chose {self.strategy} with {self.dtype.name} cells on {self.threads} thread{'s' if self.threads > 1 else ''}{tiling}: "
+            f"the fastest estimated strategy {limit}, needing about {_format_bytes(self.estimated_bytes)} and {self.estimated_seconds:.2f}s."
+        ]
+        return "\n".join(lines)
+
+
+def _threaded_throughput(
+    measurement: Dict[str, Any],
+    threads: int
+) -> float:
+    """
+    Helper function for plan_run().
+    Interpolates Numba throughput linearly between the one thread and all threads measurements.
+    """
+
+    max_threads: int = measurement["max_threads"]
+    if max_threads <= 1:
+        return measurement["cells_per_second"]
+    fraction: float = (threads - 1) / (max_threads - 1)
+    return measurement["cells_per_second"] + fraction * (measurement["cells_per_second_all_threads"] - measurement["cells_per_second"])
+
+
+def plan_run(
+    shape: Tuple[int, int],
+    steps: int,
+    update_rate: float = 1.0,
+    memory_cap: float | None = None,
+    threads: int | None = None,
+    calibration: Dict[str, Any] | None = None
+) -> Plan:
+    """
+    Chooses the fastest strategy, cell data type, tiling and thread count whose estimated memory fits the cap.
+    Estimates scale the calibration's per-cell memory and throughput to the grid size. Memory estimates cover
+    the starting grid passed to Plan.build() as an int array, as get_start() returns it, building the automaton and stepping.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        Shape of the grid.
+    steps : int
+        Number of steps to be applied.
+    update_rate : float
+        Update rate of the run. Temporal blocking is only considered for synchronous updating.
+    memory_cap : float or None
+        Maximum estimated memory in bytes. If None, memory does not limit the choice.
+    threads : int or None
+        Maximum number of threads. If None, all threads available to Numba.
+    calibration : dict or None
+        Measurements from load_calibration() or calibrate(). If None, the cached calibration is loaded.
+
+    Returns
+    ----------
+    plan : Plan
+        Chosen configuration, with the estimates of every candidate.
+    """
+
+    if calibration is None:
+        calibration: Dict[str, Any] = load_calibration()
+    cells: int = int(np.prod(shape))
+    mode: str = "sync" if np.isclose(update_rate, 1.0) else "async"
+    thread_budget: int = _max_threads() if threads is None else threads
+
+    # --- Estimating Candidates ---
+    candidates: list[Dict[str, Any]] = []
+    for key, measurement in calibration["measurements"].items():
+        strategy, dtype_name, measured_mode = key.split("/")
+        if measured_mode != mode or (strategy == "numba" and not NUMBA_AVAILABLE):
+            continue
+        if strategy == "numba":
+            # The calibration may have been measured with more threads than this process can use
+            candidate_threads: int = max(1, min(thread_budget, _max_threads(), measurement["max_threads"]))
+            cells_per_second: float = _threaded_throughput(measurement, candidate_threads)
+        else:
+            candidate_threads: int = 1
+            cells_per_second: float = measurement["cells_per_second"]
+
+        candidate: Dict[str, Any] = {
+            "strategy": strategy,
+            "dtype": dtype_name,
+            "threads": candidate_threads,
+            "bytes": measurement["bytes_per_cell"] * cells,
+            "seconds": cells * steps / cells_per_second,
+            "rejected": None
+        }
+        if "tile_size" in measurement:
+            candidate["tile_size"] = measurement["tile_size"]
+        if memory_cap is not None and candidate["bytes"] > memory_cap:
+            candidate["rejected"] = "exceeds memory cap"
+        elif strategy == "numpy-blocked" and steps < 2:
+            candidate["rejected"] = "blocking needs at least 2 steps"
+        candidates.append(candidate)
+    candidates.sort(key=lambda candidate: (candidate["seconds"], candidate["bytes"]))
+
+    # --- Choosing Fastest Candidate Within Limits ---
+    feasible: list[Dict[str, Any]] = [candidate for candidate in candidates if candidate["rejected"] is None]
+    if not feasible:
+        smallest: float = min(candidate["bytes"] for candidate in candidates)
+        raise MemoryError(f"No strategy fits a {shape[0]}x{shape[1]} grid in {_format_bytes(memory_cap)}. The smallest needs about {_format_bytes(smallest)}.")
+    for candidate in feasible[1:]:
+        candidate["rejected"] = "slower"
+
+    return Plan(shape, steps, update_rate, memory_cap, thread_budget, calibration, candidates, feasible[0])
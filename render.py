@@ -1,11 +1,18 @@
 import numpy as np
-from typing import Dict
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, Tuple
 from numpy.typing import ArrayLike
 from rich.live import Live
 from rich.text import Text
+import os
+import shutil
 import time
+from functools import partial
 
-from sim import CellularAutomaton, _normalize_grid_state
+from validation import DISPLAY_MODES, _normalize_grid_state
+# Only needed for annotations. Rendering frames streamed from a job server does not load the simulation
+if TYPE_CHECKING:
+    from sim import CellularAutomaton
+    from checkpoint import Checkpointer
 
 
 # Numpy arrays will be converted to rich.text.Text objects for display in the terminal
@@ -17,9 +24,29 @@ _STATE_TO_TEXT: Dict[int, str] = {
 }
 _SEP: str = "|"  # separator between cells. "|" results in a nice grid look.
 
+# Dense display modes pack several cells into one character
+# Each mode maps to the (rows, columns) of pooled pixels drawn by one character
+_PIXELS_PER_CHAR: Dict[str, Tuple[int, int]] = {
+    "grid": (1, 1),  # one cell per _render_state() cell
+    "half": (2, 1),  # upper and lower half blocks
+    "braille": (4, 2)  # 8 braille dots
+}
+# Half-block glyphs indexed by (upper pixel) + 2 * (lower pixel)
+_HALF_BLOCK_WEIGHTS: np.ndarray = np.array([[1], [2]])
+_HALF_BLOCK_CODEPOINTS: np.ndarray = np.array([ord(" "), ord("▀"), ord("▄"), ord("█")], dtype=np.uint32)
+# Braille glyphs are U+2800 plus one bit per dot, numbered down the left column then the right
+_BRAILLE_WEIGHTS: np.ndarray = np.array([
+    [0x01, 0x08],
+    [0x02, 0x10],
+    [0x04, 0x20],
+    [0x40, 0x80]
+])
+_BRAILLE_BASE: int = 0x2800
+
 
 def _render_state(
-    grid_state: ArrayLike
+    grid_state: ArrayLike,
+    trusted: bool = False
 ) -> Text:
     """
     Helper function for render_rollout().
@@ -29,6 +56,8 @@ def _render_state(
     ----------
     grid_state : array-like
         Current state of CA grid stored as 1s and 0s in a 2D array.
+    trusted : bool
+        If True, grid_state is known to be a valid integer state from the simulation and is not scanned.
     
     Returns
     ---------
@@ -38,7 +67,7 @@ def _render_state(
 
     # --- Input Error Handling ---
     # Checking grid_state is valid and ensuring/converting to numpy array
-    grid_state: np.ndarray = _normalize_grid_state(grid_state)
+    grid_state: np.ndarray = _normalize_grid_state(grid_state, trusted=trusted, copy=False, dtype=None)
     
     # Initialize list for containing lines of text for state visualization
     lines: list[str] = []
@@ -66,10 +95,315 @@ def _render_state(
     return Text(state_string)
 
 
+def _codepoints_to_text(
+    codepoints: np.ndarray
+) -> Text:
+    """
+    Helper function for Viewport.render().
+    Turns a 2D array of unicode codepoints into rich.text.Text without looping over characters.
+    """
+
+    num_cols: int = codepoints.shape[1]
+    # Reinterpret each row of 4 byte codepoints as one fixed width unicode string
+    rows: np.ndarray = np.ascontiguousarray(codepoints, dtype=np.uint32).view(f"<U{num_cols}")[:, 0]
+    return Text("\n".join(rows.tolist()))
+
+
+def _wrapped_window(
+    grid_state: np.ndarray,
+    start: int,
+    length: int,
+    axis: int
+) -> np.ndarray:
+    """
+    Helper function for Viewport.pool().
+    Selects length cells along axis starting at start, wrapping past the edge.
+    Returns a view when the window does not wrap.
+    """
+
+    size: int = grid_state.shape[axis]
+    start: int = start % size
+
+    def along_axis(cells: slice) -> np.ndarray:
+        """
+        Slices only the chosen axis, keeping the other axis whole.
+
+        Parameters
+        ----------
+        cells : slice
+            Range of cells to select along axis.
+
+        Returns
+        ----------
+        window : np.ndarray
+            View of grid_state restricted to cells along axis.
+        """
+
+        index: list[slice] = [slice(None)] * grid_state.ndim
+        index[axis] = cells
+        return grid_state[tuple(index)]
+
+    if start + length <= size:
+        return along_axis(slice(start, start + length))
+    # Join the slice up to the edge with the slice continuing from the opposite edge
+    return np.concatenate((along_axis(slice(start, size)), along_axis(slice(0, start + length - size))), axis=axis)
+
+
+class Viewport:
+    """
+    Window onto a grid state for rendering grids larger than the terminal.
+    Only the visible cells are pooled and formatted each frame.
+    Cells are downsampled by zoom x zoom block pooling, then drawn as grid cells,
+    half blocks (2 pixels per character) or braille (8 pixels per character).
+    Panning wraps around the edges like the toroidal grid itself.
+
+    Attributes
+    ----------
+    rows : int
+        Height of the viewport in characters.
+    cols : int
+        Width of the viewport in characters.
+    mode : str
+        One of DISPLAY_MODES.
+    row : int
+        Grid row shown in the top left corner.
+    col : int
+        Grid column shown in the top left corner.
+    zoom : int
+        Side length in cells of each pooled block. 1 shows every cell.
+    threshold : float
+        Pooled pixels are drawn alive when the fraction of living cells in their block exceeds this.
+        0.0 draws any block with a living cell (block-OR).
+    """
+
+    def __init__(
+        self,
+        rows: int,
+        cols: int,
+        mode: str = "braille",
+        row: int = 0,
+        col: int = 0,
+        zoom: int = 1,
+        threshold: float = 0.0
+    ):
+        if mode not in DISPLAY_MODES:
+            raise ValueError(f"mode must be one of {DISPLAY_MODES}. Received {mode!r}.")
+        if zoom < 1:
+            raise ValueError(f"zoom must be a positive integer. Received {zoom}.")
+        if not (0 <= threshold < 1):
+            raise ValueError(f"threshold must be at least 0 and below 1. Received {threshold}.")
+
+        self.rows: int = rows
+        self.cols: int = cols
+        self.mode: str = mode
+        self.row: int = row
+        self.col: int = col
+        self.zoom: int = zoom
+        self.threshold: float = threshold
+
+
+    @classmethod
+    def for_terminal(
+        cls,
+        mode: str = "braille",
+        zoom: int | None = None,
+        grid_shape: Tuple[int, int] | None = None,
+        threshold: float = 0.0
+    ) -> "Viewport":
+        """
+        Creates a viewport filling the current terminal.
+        If zoom is None and grid_shape is given, zooms out until the whole grid fits.
+        """
+
+        terminal_size: os.terminal_size = shutil.get_terminal_size()
+        viewport: Viewport = cls(terminal_size.lines, terminal_size.columns, mode=mode, zoom=zoom or 1, threshold=threshold)
+        if zoom is None and grid_shape is not None:
+            viewport.fit(grid_shape)
+        return viewport
+
+
+    def _pixel_capacity(self) -> Tuple[int, int]:
+        """
+        Helper function returning how many pooled pixels fit in the viewport as (rows, columns).
+        """
+
+        # The grid mode draws a roof line and separators around every cell
+        if self.mode == "grid":
+            return self.rows - 1, (self.cols - len(_SEP)) // (len(_SEP) + _CELL_WIDTH)
+        pixel_rows, pixel_cols = _PIXELS_PER_CHAR[self.mode]
+        return self.rows * pixel_rows, self.cols * pixel_cols
+
+
+    def fit(
+        self,
+        grid_shape: Tuple[int, int]
+    ) -> None:
+        """
+        Sets the smallest zoom at which a grid of grid_shape fits entirely in the viewport.
+        """
+
+        capacity_rows, capacity_cols = self._pixel_capacity()
+        # Round the block size up so the pooled grid never exceeds the capacity
+        zoom_rows: int = -(-grid_shape[0] // max(1, capacity_rows))
+        zoom_cols: int = -(-grid_shape[1] // max(1, capacity_cols))
+        self.zoom: int = max(1, zoom_rows, zoom_cols)
+
+
+    def pan(
+        self,
+        d_rows: int,
+        d_cols: int
+    ) -> None:
+        """
+        Moves the viewport by d_rows and d_cols pooled pixels.
+        """
+
+        self.row += d_rows * self.zoom
+        self.col += d_cols * self.zoom
+
+
+    def zoom_in(self) -> None:
+        """
+        Halves the pooling block size, down to one cell per pixel.
+        """
+
+        self.zoom: int = max(1, self.zoom // 2)
+
+
+    def zoom_out(self) -> None:
+        """
+        Doubles the pooling block size.
+        """
+
+        self.zoom *= 2
+
+
+    def pool(
+        self,
+        grid_state: np.ndarray
+    ) -> np.ndarray:
+        """
+        Pools the visible window of the grid into pixels, rounded up to whole characters.
+
+        Parameters
+        ----------
+        grid_state : np.ndarray
+            Full binary grid state.
+
+        Returns
+        ----------
+        pixels : np.ndarray
+            Boolean array of pooled pixels. Blocks past the edge of the grid count as dead.
+        """
+
+        # --- Selecting Visible Window ---
+        # Never show more cells than the grid has, so wrapping does not duplicate cells
+        capacity: Tuple[int, int] = self._pixel_capacity()
+        pixel_rows, pixel_cols = _PIXELS_PER_CHAR[self.mode]
+        num_rows: int = min(capacity[0] * self.zoom, grid_state.shape[0])
+        num_cols: int = min(capacity[1] * self.zoom, grid_state.shape[1])
+        # Wrap the window around the edges like the toroidal grid
+        window: np.ndarray = _wrapped_window(grid_state, self.row, num_rows, axis=0)
+        window: np.ndarray = _wrapped_window(window, self.col, num_cols, axis=1)
+
+        # --- Pooling Blocks ---
+        # Pad with dead cells to whole characters worth of whole blocks
+        block_rows: int = self.zoom * pixel_rows
+        block_cols: int = self.zoom * pixel_cols
+        padding: Tuple[Tuple[int, int], ...] = ((0, -num_rows % block_rows), (0, -num_cols % block_cols))
+        padded: np.ndarray = np.pad(window, padding) if any(after for _, after in padding) else window
+        # Reshape so each block has its own axes, then count living cells per block
+        out_rows: int = padded.shape[0] // self.zoom
+        out_cols: int = padded.shape[1] // self.zoom
+        counts: np.ndarray = padded.reshape(out_rows, self.zoom, out_cols, self.zoom).sum(axis=(1, 3))
+        return counts > self.threshold * self.zoom * self.zoom
+
+
+    def render(
+        self,
+        grid_state: np.ndarray
+    ) -> Text:
+        """
+        Renders the visible window of the grid as rich.text.Text.
+
+        Parameters
+        ----------
+        grid_state : np.ndarray
+            Full binary grid state.
+
+        Returns
+        ----------
+        text : rich.text.Text
+            Rich text object for display in the terminal.
+        """
+
+        pixels: np.ndarray = self.pool(grid_state)
+        if self.mode == "grid":
+            return _render_state(pixels)
+
+        # Give each character its own pair of axes and weight its pixels into a glyph index
+        pixel_rows, pixel_cols = _PIXELS_PER_CHAR[self.mode]
+        num_rows: int = pixels.shape[0] // pixel_rows
+        num_cols: int = pixels.shape[1] // pixel_cols
+        char_pixels: np.ndarray = pixels.reshape(num_rows, pixel_rows, num_cols, pixel_cols)
+        if self.mode == "half":
+            glyphs: np.ndarray = (char_pixels * _HALF_BLOCK_WEIGHTS[None, :, None, :]).sum(axis=(1, 3))
+            codepoints: np.ndarray = _HALF_BLOCK_CODEPOINTS[glyphs]
+        else:
+            glyphs: np.ndarray = (char_pixels * _BRAILLE_WEIGHTS[None, :, None, :]).sum(axis=(1, 3))
+            codepoints: np.ndarray = _BRAILLE_BASE + glyphs
+        return _codepoints_to_text(codepoints)
+
+
+def render_frames(
+    frames: Iterable[Tuple[int, np.ndarray]],
+    seconds_per_step: float = 0.6,
+    viewport: Viewport | None = None,
+    after_frame: Callable[[], None] | None = None
+) -> None:
+    """
+    Renders a stream of grid states in the terminal using rich library's rich.live.Live objects.
+    The frames may come from a local rollout or from a job server.
+    
+    Parameters
+    ----------
+    frames : iterable
+        Pairs of generation and grid state, starting with the starting state.
+    seconds_per_step : float
+        Number of seconds to wait between steps of the animation.
+    viewport : Viewport or None
+        If given, only the window shown by the viewport is rendered, pooled into dense glyphs.
+        If None the whole grid is rendered with one grid cell per cell.
+    after_frame : callable or None
+        Called after each frame following the starting state is displayed.
+    """
+
+    # The first frame is the starting state
+    frames: Iterator[Tuple[int, np.ndarray]] = iter(frames)
+    _, starting_state = next(frames)
+    # Choose between rendering the full grid and rendering the viewport window
+    # Frames come straight from the simulation, so the full render can skip validating every cell
+    render_state: Callable[[np.ndarray], Text] = partial(_render_state, trusted=True) if viewport is None else viewport.render
+    # Convert starting CA grid state to rich.text.Text object to display in terminal
+    starting_state_render: Text = render_state(starting_state)
+
+    # --- Creating animation with rich.live.Live ---
+    with Live(starting_state_render, refresh_per_second=60, screen=True) as live:
+        for _, grid_state in frames:
+            # Convert CA grid state to Text object and update Live display with new state
+            live.update(render_state(grid_state))
+            if after_frame is not None:
+                after_frame()
+            # Wait to slow down animation
+            time.sleep(seconds_per_step)
+
+
 def render_rollout(
-    ca: CellularAutomaton,
+    ca: "CellularAutomaton",
     steps: int,
-    seconds_per_step: float = 0.6
+    seconds_per_step: float = 0.6,
+    checkpointer: "Checkpointer | None" = None,
+    viewport: Viewport | None = None
 ) -> None:
     """
     Renders cellular automaton rollout in the terminal using rich library's rich.live.Live objects.
@@ -82,17 +416,14 @@ def render_rollout(
         Number of steps to rollout the CA in the animation.
     seconds_per_step : float
         Number of seconds to wait between steps of the animation.
+    checkpointer : Checkpointer or None
+        If given, periodically saves the CA state in the background during the rollout.
+    viewport : Viewport or None
+        If given, only the window shown by the viewport is rendered, pooled into dense glyphs.
+        If None the whole grid is rendered with one grid cell per cell.
     """
-    
-    # Convert starting CA grid state to rich.text.Text object to display in terminal
-    starting_state_render: Text = _render_state(ca.grid_state)
 
-    # --- Creating animation with rich.live.Live ---
-    with Live(starting_state_render, refresh_per_second=60, screen=True) as live:
-        for _ in range(steps):
-            # Update grid state by applying CA update rule
-            ca.step()
-            # Convert CA grid state to Text object and update Live display with new state
-            live.update(_render_state(ca.grid_state))
-            # Wait to slow down animation
-            time.sleep(seconds_per_step)
\ No newline at end of file
+    # Save resumable state every checkpointer.every generations
+    after_frame: Callable[[], None] | None = None if checkpointer is None else partial(checkpointer.maybe_save, ca)
+    # Stream grid states lazily, each frame after the first applies the CA update rule once
+    render_frames(ca.rollout(steps), seconds_per_step, viewport, after_frame)
\ No newline at end of file
@@ -0,0 +1,171 @@
+import re
+import numpy as np
+from functools import lru_cache
+from typing import Iterable
+
+
+# Dead cells index row 0 of a rule table, living cells index row 1, neighbor counts index the columns
+MAX_NEIGHBORS: int = 8
+# Compiled once and reused for every rule string, S<digits>B<digits>
+_RULE_PATTERN: re.Pattern = re.compile(r"S(\d*)B(\d*)")
+
+
+def make_rule_table(
+    survive_set: set,
+    birth_set: set,
+    dtype: np.dtype = int
+) -> np.ndarray:
+    """
+    Builds a lookup table of next states indexed by [current state, living neighbor count].
+
+    Parameters
+    ----------
+    survive_set : set
+        Set of neighbor counts that result in living cells remaining alive.
+    birth_set : set
+        Set of neighbor counts that result in dead cells transitioning to alive.
+    dtype : np.dtype
+        Data type of the table, matching the grid state it will be applied to.
+
+    Returns
+    ----------
+    rule_table : np.ndarray
+        Array of shape (2, 9) with the next state for each current state and neighbor count.
+    """
+
+    rule_table: np.ndarray = np.zeros((2, MAX_NEIGHBORS + 1), dtype=dtype)
+    # Counts outside 0-8 can never occur, so they are left out rather than raising errors
+    rule_table[0, [count for count in birth_set if 0 <= count <= MAX_NEIGHBORS]] = 1
+    rule_table[1, [count for count in survive_set if 0 <= count <= MAX_NEIGHBORS]] = 1
+    return rule_table
+
+
+class Rule:
+    """
+    Immutable update rule, reusable across cellular automata and sweep jobs.
+    Neighbor counts outside 0-8 can never occur, so they are dropped.
+
+    Attributes
+    ----------
+    survive_set : frozenset
+        Neighbor counts that result in living cells remaining alive.
+    birth_set : frozenset
+        Neighbor counts that result in dead cells transitioning to alive.
+    table : np.ndarray
+        Read-only lookup table of next states indexed by [current state, neighbor count].
+    """
+
+    def __init__(
+        self,
+        survive_set: Iterable[int],
+        birth_set: Iterable[int]
+    ):
+        self.survive_set: frozenset = frozenset(count for count in survive_set if 0 <= count <= MAX_NEIGHBORS)
+        self.birth_set: frozenset = frozenset(count for count in birth_set if 0 <= count <= MAX_NEIGHBORS)
+        self.table: np.ndarray = make_rule_table(self.survive_set, self.birth_set)
+        # Rules are shared between automata, so protect the table from accidental edits
+        self.table.flags.writeable = False
+
+
+    @property
+    def rule_string(self) -> str:
+        """
+        Rule written as S<digits>B<digits>, e.g. "S23B3".
+        """
+
+        survive_digits: str = "".join(map(str, sorted(self.survive_set)))
+        birth_digits: str = "".join(map(str, sorted(self.birth_set)))
+        return f"S{survive_digits}B{birth_digits}"
+
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Rules are equal when they have the same survival and birth sets.
+        """
+
+        if not isinstance(other, Rule):
+            return NotImplemented
+        return (self.survive_set, self.birth_set) == (other.survive_set, other.birth_set)
+
+
+    def __hash__(self) -> int:
+        """
+        Hashes the survival and birth sets, consistent with __eq__(), so rules can key caches.
+        """
+
+        return hash((self.survive_set, self.birth_set))
+
+
+    def __repr__(self) -> str:
+        """
+        Returns the rule in its rule string form, e.g. Rule('S23B3').
+        """
+
+        return f"Rule({self.rule_string!r})"
+
+
+@lru_cache(maxsize=None)
+def _cached_rule(
+    survive_set: frozenset,
+    birth_set: frozenset
+) -> Rule:
+    """
+    Helper function for rule_from_sets() and parse_rule(). Builds each distinct rule only once.
+    """
+
+    return Rule(survive_set, birth_set)
+
+
+def rule_from_sets(
+    survive_set: Iterable[int],
+    birth_set: Iterable[int]
+) -> Rule:
+    """
+    Returns the shared Rule object for a pair of survival and birth sets.
+
+    Parameters
+    ----------
+    survive_set : iterable of int
+        Neighbor counts that result in living cells remaining alive.
+    birth_set : iterable of int
+        Neighbor counts that result in dead cells transitioning to alive.
+
+    Returns
+    ----------
+    rule : Rule
+        Cached rule object. The same object is returned for equal sets.
+    """
+
+    return _cached_rule(frozenset(survive_set), frozenset(birth_set))
+
+
+@lru_cache(maxsize=1024)
+def parse_rule(
+    rule_string: str
+) -> Rule:
+    """
+    Parses a rule string following the pattern S<digits>B<digits>, e.g. "S23B3".
+    Results are cached, so parsing the same rule again in a sweep is a dictionary lookup.
+
+    Parameters
+    ----------
+    rule_string : str
+        Rule string. Digits after S are survival counts, digits after B are birth counts.
+
+    Returns
+    ----------
+    rule : Rule
+        Cached rule object.
+    """
+
+    if not isinstance(rule_string, str):
+        raise TypeError("--rule-string must be a string.")
+    match: re.Match | None = _RULE_PATTERN.fullmatch(rule_string)
+    if match is None:
+        raise ValueError("--rule-string must follow the pattern S<digits>B<digits>. No other characters are allowed.")
+    # Check that rule is possible (a cell can have at maximum 8 living neighbors)
+    if "9" in rule_string:
+        raise Warning("--rule_string includes 9 but there cannot be more than 8 living neighbors")
+
+    survive_str, birth_str = match.groups()
+    return rule_from_sets(map(int, survive_str), map(int, birth_str))
@@ -0,0 +1,390 @@
+import numpy as np
+import typer
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Annotated, Any, Dict, Iterator, Tuple
+
+from sim import CellularAutomaton
+from rules import Rule, parse_rule
+from starting_states import START_OPTIONS
+from validation import validate_run_spec
+from frame_codec import encode_frame
+
+
+DEFAULT_HOST: str = "127.0.0.1"
+DEFAULT_PORT: int = 8765
+# Jobs admitted per worker (running plus queued) before new jobs are turned away
+PENDING_PER_WORKER: int = 4
+# Frames computed per segment, bounding the memory of long runs and the delay before the first frame
+FRAMES_PER_SEGMENT: int = 256
+
+# Run spec fields and their defaults, matching the options of main.main()
+DEFAULT_SPEC: Dict[str, Any] = {
+    "steps": 30,
+    "rule_string": "S23B3",
+    "start_choice": "random_choice",
+    "update_rate": 1.0,
+    "seed": None,
+    "stride": 1
+}
+
+
+def _warm_worker() -> None:
+    """
+    Initializer for the worker processes.
+    Workers are spawned fresh, so this imports the simulation, compiles the default rule and,
+    when Numba is installed, loads the fused kernel so the first job does not pay for it.
+    """
+
+    rule: Rule = parse_rule(DEFAULT_SPEC["rule_string"])
+    ca: CellularAutomaton = CellularAutomaton(START_OPTIONS["gliders"], rule.survive_set, rule.birth_set)
+    ca.step()
+
+
+def start_job(
+    spec: Dict[str, Any]
+) -> Tuple[str, CellularAutomaton]:
+    """
+    Builds the cellular automaton for a run spec in a worker process.
+
+    Parameters
+    ----------
+    spec : dict
+        Complete run spec with the fields of DEFAULT_SPEC, already validated.
+
+    Returns
+    ----------
+    start_choice : str
+        Name of the starting state, resolving "random_choice" to the state that was picked.
+    ca : CellularAutomaton
+        Cellular automaton at generation 0.
+    """
+
+    # "randomize" is interactive, so a random choice only picks from the stored starting states
+    start_choice: str = spec["start_choice"]
+    if start_choice == "random_choice":
+        start_choice: str = str(np.random.choice(list(START_OPTIONS.keys())))
+
+    rule: Rule = parse_rule(spec["rule_string"])
+    ca: CellularAutomaton = CellularAutomaton(
+        grid_state=START_OPTIONS[start_choice],
+        survive_set=set(rule.survive_set),
+        birth_set=set(rule.birth_set),
+        update_rate=spec["update_rate"],
+        rng=np.random.default_rng(spec["seed"])
+    )
+    return start_choice, ca
+
+
+def run_segment(
+    ca: CellularAutomaton,
+    steps: int,
+    stride: int,
+    include_start: bool
+) -> Tuple[CellularAutomaton, list[Tuple[int, str]]]:
+    """
+    Advances a cellular automaton by up to steps steps in a worker process.
+    Long runs are split into segments so frames can be sent back while later segments are computed.
+
+    Parameters
+    ----------
+    ca : CellularAutomaton
+        Cellular automaton returned by start_job() or by the previous segment.
+    steps : int
+        Number of steps in this segment. A multiple of stride, except for the last segment.
+    stride : int
+        Only every stride-th generation is returned.
+    include_start : bool
+        Whether to return the current state. Only the first segment does, later
+        segments start where the previous segment's last frame ended.
+
+    Returns
+    ----------
+    ca : CellularAutomaton
+        Cellular automaton after the segment, to pass on to the next segment.
+    frames : list of tuple
+        Encoded frames as (generation, cells) pairs.
+    """
+
+    frames: list[Tuple[int, str]] = [
+        (generation, encode_frame(grid_state))
+        for generation, grid_state in ca.rollout(steps, stride=stride)
+    ]
+    return ca, frames if include_start else frames[1:]
+
+
+def parse_spec(
+    body: bytes
+) -> Dict[str, Any]:
+    """
+    Parses and validates a JSON run spec, filling in defaults for missing fields.
+    Raises TypeError, ValueError or Warning like validate_inputs() when invalid.
+    """
+
+    try:
+        request: Any = json.loads(body)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Run spec is not valid JSON: {e}") from e
+    if not isinstance(request, dict):
+        raise TypeError("Run spec must be a JSON object.")
+    unknown_fields: set = set(request) - set(DEFAULT_SPEC)
+    if unknown_fields:
+        raise ValueError(f"Unknown run spec fields: {', '.join(sorted(unknown_fields))}.")
+
+    spec: Dict[str, Any] = {**DEFAULT_SPEC, **request}
+    validate_run_spec(spec["steps"], spec["rule_string"], spec["start_choice"], spec["update_rate"], spec["seed"])
+    if spec["start_choice"] == "randomize":
+        raise ValueError("--start randomize asks for input interactively and cannot be run by the server.")
+    if not isinstance(spec["stride"], int) or spec["stride"] < 1:
+        raise ValueError("stride must be a positive integer.")
+    return spec
+
+
+class JobServer(ThreadingHTTPServer):
+    """
+    Local HTTP server running simulation jobs on a pool of warm worker processes.
+    POST /run with a JSON run spec streams back newline-delimited JSON: a header line with the
+    starting state and grid shape, one line per frame, then a final line marking the end.
+    GET /health reports the pool size and the number of pending jobs.
+    Jobs beyond max_pending are rejected with 503 so clients can back off.
+
+    Attributes
+    ----------
+    workers : int
+        Number of worker processes.
+    max_pending : int
+        Maximum number of running plus queued jobs.
+    executor : ProcessPoolExecutor
+        Pool of warm worker processes.
+    """
+
+    # Request threads do not keep the server alive on shutdown
+    daemon_threads: bool = True
+
+    def __init__(
+        self,
+        address: tuple[str, int] = (DEFAULT_HOST, DEFAULT_PORT),
+        workers: int | None = None,
+        max_pending: int | None = None
+    ):
+        super().__init__(address, _JobRequestHandler)
+        self.workers: int = workers or os.cpu_count() or 1
+        self.max_pending: int = self.workers * PENDING_PER_WORKER if max_pending is None else max_pending
+        # Forking a process that has already run the parallel Numba kernel can deadlock its workers,
+        # so workers are spawned as fresh interpreters and warmed by _warm_worker() instead
+        self.executor: ProcessPoolExecutor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker
+        )
+        self._pending: int = 0
+        self._pending_lock: threading.Lock = threading.Lock()
+        # Start and warm every worker now rather than on the first requests
+        for future in [self.executor.submit(int) for _ in range(self.workers)]:
+            future.result()
+
+
+    def try_admit(self) -> bool:
+        """
+        Reserves a slot for a new job. Returns False if max_pending jobs are already admitted.
+        """
+
+        with self._pending_lock:
+            if self._pending >= self.max_pending:
+                return False
+            self._pending += 1
+            return True
+
+
+    def release(self) -> None:
+        """
+        Frees the slot reserved by try_admit() once a job has finished.
+        """
+
+        with self._pending_lock:
+            self._pending -= 1
+
+
+    def health(self) -> Dict[str, int]:
+        """
+        Returns the number of workers, pending jobs and the admission limit.
+        """
+
+        with self._pending_lock:
+            return {"workers": self.workers, "pending": self._pending, "max_pending": self.max_pending}
+
+
+    def run(
+        self,
+        spec: Dict[str, Any]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Runs a validated run spec on the worker pool, yielding the messages streamed to the client.
+        The next segment is submitted before the frames of the current one are yielded,
+        so the workers keep computing while the client reads. If the generator is closed early,
+        e.g. because the client disconnected, it waits for the segment in flight before returning,
+        so the job's admission slot is only released once its worker is free.
+        """
+
+        start_choice, ca = self.executor.submit(start_job, spec).result()
+        yield {"start_choice": start_choice, "shape": list(ca.grid_state.shape)}
+
+        segment_steps: int = spec["stride"] * FRAMES_PER_SEGMENT
+        steps_left: int = spec["steps"]
+        # The first segment also returns the starting state
+        next_steps: int = min(segment_steps, steps_left)
+        future: Future | None = self.executor.submit(run_segment, ca, next_steps, spec["stride"], True)
+        steps_left -= next_steps
+        try:
+            while future is not None:
+                ca, frames = future.result()
+                future: Future | None = None
+                if steps_left > 0:
+                    next_steps: int = min(segment_steps, steps_left)
+                    future: Future = self.executor.submit(run_segment, ca, next_steps, spec["stride"], False)
+                    steps_left -= next_steps
+                for generation, cells in frames:
+                    yield {"generation": generation, "cells": cells}
+            yield {"done": True}
+        finally:
+            # A queued segment is dropped, a running one cannot be interrupted so it is waited for
+            if future is not None and not future.cancel():
+                wait([future])
+
+
+    def server_close(self) -> None:
+        """
+        Closes the listening socket and shuts down the worker processes, cancelling queued jobs.
+        """
+
+        super().server_close()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+class _JobRequestHandler(BaseHTTPRequestHandler):
+    """
+    Request handler for JobServer. Each request is handled on its own thread,
+    which waits for the worker process running its job.
+    """
+
+    server: JobServer
+
+    def _send_json(
+        self,
+        status: int,
+        body: Dict[str, Any],
+        headers: Dict[str, str] = {}
+    ) -> None:
+        """
+        Helper function sending a complete JSON response.
+        """
+
+        payload: bytes = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+    def do_GET(self) -> None:
+        """
+        Answers GET /health with the pool size and number of pending jobs.
+        """
+
+        if self.path != "/health":
+            self._send_json(404, {"error": f"Unknown path {self.path}."})
+            return
+        self._send_json(200, self.server.health())
+
+
+    def do_POST(self) -> None:
+        """
+        Answers POST /run by validating the run spec, admitting the job and streaming its frames.
+        """
+
+        if self.path != "/run":
+            self._send_json(404, {"error": f"Unknown path {self.path}."})
+            return
+
+        # --- Validating Run Spec ---
+        try:
+            body: bytes = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            spec: Dict[str, Any] = parse_spec(body)
+        except (TypeError, ValueError, Warning) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        # --- Admission Control ---
+        if not self.server.try_admit():
+            self._send_json(503, {"error": "Server is busy, try again shortly."}, {"Retry-After": "1"})
+            return
+
+        # --- Streaming Frames ---
+        # The response ends when the connection closes, so each message is sent as soon as it is ready
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.end_headers()
+            messages: Iterator[Dict[str, Any]] = self.server.run(spec)
+            try:
+                for message in messages:
+                    self.wfile.write(json.dumps(message).encode() + b"\n")
+            except (BrokenPipeError, ConnectionResetError):
+                # The client stopped reading, e.g. the animation was interrupted
+                pass
+            except Exception as e:
+                self.wfile.write(json.dumps({"error": f"Job failed: {e}"}).encode() + b"\n")
+            finally:
+                # Closing the generator waits for its segment in flight, so the slot is released with the worker
+                messages.close()
+        finally:
+            self.server.release()
+
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """
+        Silences the default per-request logging. Errors are reported to the client in the response.
+        """
+
+        pass
+
+
+# Following standard typer app pattern for shell parameter parsing and --help customization
+app = typer.Typer()
+
+@app.command()
+def main(
+    host: Annotated[str, typer.Option("--host", help="Address to listen on. Keep the default to only accept local connections.")] = DEFAULT_HOST,
+    port: Annotated[int, typer.Option("--port", "-p", help="Port to listen on.")] = DEFAULT_PORT,
+    workers: Annotated[int | None, typer.Option("--workers", "-w", help="Number of worker processes. Defaults to the number of CPUs.")] = None,
+    max_pending: Annotated[int | None, typer.Option("--max-pending", help="Maximum running plus queued jobs before new jobs are rejected. Defaults to 4 per worker.")] = None
+):
+    """
+    Runs a local job server that keeps warm worker processes ready for simulation runs.
+    Point main.py at it with --server to skip startup costs on every run.
+
+    Examples
+    ----------
+    $ python server.py --port 8765 --workers 4
+    $ python main.py -s 100 --start gliders --server http://127.0.0.1:8765
+    """
+
+    server: JobServer = JobServer((host, port), workers=workers, max_pending=max_pending)
+    print(f"Serving on http://{host}:{server.server_address[1]} with {server.workers} workers. Press Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    app()
@@ -1,42 +1,23 @@
 import numpy as np
+import asyncio
+from typing import Hashable, Iterator, AsyncIterator, Tuple
 from numpy.typing import ArrayLike
 from numpy.random import Generator
 from scipy.signal import convolve2d
 
+from kernels import NUMBA_AVAILABLE, DEFAULT_TILE_SIZE, DEFAULT_BLOCK_STEPS, blocked_steps
+from rules import MAX_NEIGHBORS, Rule, rule_from_sets
+from transition_cache import TransitionCache
+from validation import _normalize_grid_state
+if NUMBA_AVAILABLE:
+    from kernels import fused_step, fused_second_order_step
 
-def _normalize_grid_state(
-    grid_state: ArrayLike
-) -> np.ndarray:
-    """
-    Helper function for checking whether grid state is proper binary 2D array.
-    Also converts array-like to np.ndarray.
-
-    Parameters
-    ----------
-    grid_state : array-like
-        Grid state array to test and potentially convert.
-
-    Returns
-    ----------
-    grid_state : np.ndarray
-        Grid state now as an integer numpy array.
-    """
 
-    # Convert to integer numpy array if not already. Raise error if not possible.
-    try:
-        grid_state: np.ndarray = np.asarray(grid_state).astype(int)
-    except (TypeError, ValueError) as e:
-        raise TypeError("grid_state must be array-like.") from e
-    
-    # Enforce a 2D discrete grid space
-    # Ensure that matrix is rank 2
-    if grid_state.ndim != 2:
-        raise ValueError(f"grid_state must be 2 dimensional. Received shape {grid_state.shape}.")
-    # Ensure that grid is binary
-    if not np.isin(grid_state, (0, 1)).all():
-        raise ValueError("All cells in grid_state must be 0 or 1.")
-    
-    return grid_state
+# Step implementations that can be selected with the engine parameter
+# "auto" uses the fused Numba kernel when Numba is installed and the NumPy step otherwise
+ENGINES: Tuple[str, ...] = ("auto", "numpy", "numba")
+# Placeholder passed to the fused kernel when updating synchronously
+_NO_UPDATE_MASK: np.ndarray = np.zeros((0, 0), dtype=bool)
 
 
 class CellularAutomaton:
@@ -55,6 +36,19 @@ class CellularAutomaton:
     update_rate : float
         For asynchronous updating. Percentage chance of updating each step.
     seed : np.random.Generator
+    generation : int
+        Number of steps applied since the starting state.
+    engine : str
+        Step implementation in use, "numpy" or "numba". 
+        Both produce identical states, including when updating asynchronously with the same RNG.
+    tile_size : int
+        Side length of the tiles used when the NumPy engine advances several synchronous steps at once.
+    block_steps : int
+        Number of steps each tile is advanced before being written back. 1 disables temporal blocking.
+    transition_cache : TransitionCache or None
+        Optional cache of state transitions, which may be shared with other instances.
+    dtype : np.dtype
+        Integer data type of grid_state. np.uint8 uses 8 times less memory than the default int.
     """
 
     def __init__(
@@ -63,23 +57,57 @@ class CellularAutomaton:
         survive_set: set = {2, 3},
         birth_set: set = {3},
         update_rate: float = 1.0,
-        rng: Generator = None
+        rng: Generator = None,
+        engine: str = "auto",
+        tile_size: int = DEFAULT_TILE_SIZE,
+        block_steps: int = DEFAULT_BLOCK_STEPS,
+        transition_cache: TransitionCache | None = None,
+        dtype: np.dtype = int
     ):
-        # Checks grid is binary and converts to numpy array if not already
-        grid_state: np.ndarray = _normalize_grid_state(grid_state)
+        # Checks grid is binary and copies it straight into dtype, so large grids are never held as int first
+        if np.dtype(dtype).kind not in "iu":
+            raise ValueError(f"dtype must be an integer data type. Received {np.dtype(dtype)}.")
+        grid_state: np.ndarray = _normalize_grid_state(grid_state, dtype=dtype)
 
         self.grid_state: np.ndarray = grid_state
         self.survive_set: set = survive_set
         self.birth_set: set = birth_set
         self.update_rate: float = update_rate
         self.rng: Generator = rng
+        self.generation: int = 0
 
+        # --- Selecting Step Engine ---
+        if engine not in ENGINES:
+            raise ValueError(f"engine must be one of {ENGINES}. Received {engine!r}.")
+        if engine == "numba" and not NUMBA_AVAILABLE:
+            raise ImportError("engine=\"numba\" requires Numba. Install it with `pip install numba` or use engine=\"numpy\".")
+        if engine == "auto":
+            engine: str = "numba" if NUMBA_AVAILABLE else "numpy"
+        self.engine: str = engine
+        self.tile_size: int = tile_size
+        self.block_steps: int = block_steps
+        self.transition_cache: TransitionCache | None = transition_cache
 
-    def _count_neighbors(self):
+
+    @property
+    def rule(self) -> Rule:
+        """
+        Shared Rule object for the current survival and birth sets, including the rule table.
+        Looked up on each access so changes to survive_set and birth_set take effect.
+        """
+
+        return rule_from_sets(self.survive_set, self.birth_set)
+
+
+    def _count_neighbors(
+        self,
+        grid_state: np.ndarray | None = None
+    ):
         """
         Counts number of active neighbors in the 3x3 neighborhood around each cell.
         Returns a grid of the same size with each cells" count of active neighbors. 
         Helper function for step() method.
+        Counts neighbors in grid_state instead of the current grid state if given.
         """
 
         # Define kernel for counting neighbors in 3x3 (does not count self)
@@ -90,7 +118,7 @@ class CellularAutomaton:
         ])
         # Convolve to count number of active neighbors around each cell
         neighbor_counts: np.ndarray = convolve2d(
-            self.grid_state, 
+            self.grid_state if grid_state is None else grid_state, 
             neighbor_count_kernel, 
             mode="same",
             boundary="wrap"  # results in toroidal topology
@@ -98,9 +126,77 @@ class CellularAutomaton:
         return neighbor_counts
 
 
-    def step(self):
+    def step(
+        self,
+        n: int = 1
+    ):
         """
         Update grid state using survival and birth sets for transition dynamics.
+        Every step produces a new array, so earlier states handed out are never modified.
+
+        Parameters
+        ----------
+        n : int
+            Number of steps to apply. With the NumPy engine and synchronous updating, several steps are
+            applied at once with temporal blocking, giving identical results to n single steps.
+            With a transition cache, the state n steps ahead is looked up before being computed.
+        """
+
+        if not isinstance(n, (int, np.integer)):
+            raise TypeError(f"Number of steps must be an integer. Received {type(n).__name__}.")
+        if n < 0:
+            raise ValueError(f"Cannot apply a negative number of steps. Received {n}.")
+        synchronous: bool = bool(np.isclose(self.update_rate, 1.0))
+
+        # --- Transition Cache Lookup ---
+        # Asynchronous updates depend on the RNG so only synchronous transitions are cached
+        cache_key: Hashable | None = None
+        if self.transition_cache is not None and synchronous and n > 0:
+            cache_key: Hashable | None = self.transition_cache.key(self.grid_state, self.rule, n)
+        if cache_key is not None:
+            cached_state: np.ndarray | None = self.transition_cache.get(cache_key, dtype=self.grid_state.dtype)
+            if cached_state is not None:
+                self.grid_state: np.ndarray = cached_state
+                self.generation += n
+                return
+
+        # --- Temporal Blocking ---
+        # Asynchronous masks are drawn for the whole grid each step, so only synchronous updates are blocked
+        if n > 1 and self.engine == "numpy" and self.block_steps > 1 and synchronous:
+            self.grid_state: np.ndarray = blocked_steps(
+                self.grid_state,
+                self.rule.table,
+                n,
+                tile_size=self.tile_size,
+                block_steps=self.block_steps
+            )
+            self.generation += n
+        else:
+            for _ in range(n):
+                self._step_once()
+
+        if cache_key is not None:
+            self.transition_cache.put(cache_key, self.grid_state)
+
+
+    def _step_once(self):
+        """
+        Helper function for step(). Applies a single step with the selected engine.
+        """
+
+        if self.engine == "numba":
+            new_state: np.ndarray = self._step_fused()
+        else:
+            new_state: np.ndarray = self._step_numpy()
+
+        # Update grid_state
+        self.grid_state: np.ndarray = new_state
+        self.generation += 1
+
+
+    def _step_numpy(self) -> np.ndarray:
+        """
+        Reference NumPy implementation of step(). Returns the next grid state as a new array.
         """
 
         # Count neighbors to compare with survival and birth conditions
@@ -122,5 +218,275 @@ class CellularAutomaton:
             # Use new state where mask==1 and previous state where mask==0
             new_state: np.ndarray = (new_state * update_mask) + (self.grid_state * (1-update_mask))
 
-        # Update grid_state
-        self.grid_state: np.ndarray = new_state
\ No newline at end of file
+        # Keep the grid's data type, the arithmetic above promotes small integer types
+        return new_state.astype(self.grid_state.dtype, copy=False)
+
+
+    def _step_fused(self) -> np.ndarray:
+        """
+        Numba implementation of step(). Counts neighbors, applies the rule and the
+        asynchronous update mask in one pass. Returns the next grid state.
+        """
+
+        # Draw the update mask exactly as the NumPy step does so both engines consume the RNG identically
+        use_mask: bool = not np.isclose(self.update_rate, 1.0)
+        update_mask: np.ndarray = self.rng.random(self.grid_state.shape) <= self.update_rate if use_mask else _NO_UPDATE_MASK
+
+        # A fresh output array per step keeps earlier states, and views of them from rollout(), intact
+        # Allocation is negligible next to the kernel
+        next_state: np.ndarray = np.empty_like(self.grid_state)
+        rule_table: np.ndarray = self.rule.table.astype(self.grid_state.dtype, copy=False)
+        fused_step(self.grid_state, rule_table, update_mask, use_mask, next_state)
+        return next_state
+
+
+    def _frame(
+        self,
+        copy: bool
+    ) -> np.ndarray:
+        """
+        Helper function for rollout() and arollout().
+        Returns the current grid state either as a read-only view or as an independent copy.
+        """
+
+        if copy:
+            return self.grid_state.copy()
+        # Share memory with the grid state but prevent consumers from writing into the simulation
+        frame: np.ndarray = self.grid_state.view()
+        frame.flags.writeable = False
+        return frame
+
+
+    def rollout(
+        self,
+        steps: int | None = None,
+        stride: int = 1,
+        copy: bool = False
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Lazily steps the automaton, yielding the generation index and grid state.
+        The current state is yielded first, before any step is applied.
+
+        Parameters
+        ----------
+        steps : int or None
+            Number of steps to apply. If None the rollout continues indefinitely.
+        stride : int
+            Every step is computed but only every stride-th generation is yielded.
+        copy : bool
+            If False, frames are read-only views of each state, which later steps do not modify.
+            If True, each frame is an independent, writable copy.
+
+        Yields
+        ----------
+        (generation, grid_state) : tuple of int and np.ndarray
+            Generation index and grid state at that generation.
+        """
+
+        if stride < 1:
+            raise ValueError(f"stride must be a positive integer. Received {stride}.")
+
+        yield self.generation, self._frame(copy)
+
+        # Count steps locally so that a rollout can resume from any generation
+        step_count: int = 0
+        while steps is None or step_count < steps:
+            # Advance a whole stride at once so skipped generations can use temporal blocking
+            stride_steps: int = stride if steps is None else min(stride, steps - step_count)
+            self.step(stride_steps)
+            step_count += stride_steps
+            # Skip yielding generations between strides
+            if step_count % stride == 0:
+                yield self.generation, self._frame(copy)
+
+
+    async def arollout(
+        self,
+        steps: int | None = None,
+        stride: int = 1,
+        copy: bool = False
+    ) -> AsyncIterator[Tuple[int, np.ndarray]]:
+        """
+        Asynchronous variant of rollout() for asyncio consumers.
+        Yields control to the event loop after every stride so other tasks are not starved.
+        Parameters and yielded values are the same as rollout().
+        """
+
+        if stride < 1:
+            raise ValueError(f"stride must be a positive integer. Received {stride}.")
+
+        yield self.generation, self._frame(copy)
+
+        step_count: int = 0
+        while steps is None or step_count < steps:
+            # Advance a whole stride at once like rollout(), so strides use temporal blocking and the transition cache
+            stride_steps: int = stride if steps is None else min(stride, steps - step_count)
+            self.step(stride_steps)
+            step_count += stride_steps
+            if step_count % stride == 0:
+                yield self.generation, self._frame(copy)
+            # Let other coroutines run between strides
+            await asyncio.sleep(0)
+
+
+class SecondOrderCellularAutomaton(CellularAutomaton):
+    """
+    Reversible second-order cellular automaton (Fredkin's construction).
+    The next state is the first-order rule applied to the current state, XORed with the previous state,
+    so the previous state can always be recovered and rollouts can be run backwards exactly.
+    Uses the same rule table and neighbor counting as CellularAutomaton. Updates are always synchronous.
+
+    The previous, current and next states live in three buffers that are rotated by reference,
+    and the NumPy engine counts neighbors in preallocated scratch buffers, so stepping in either direction
+    allocates nothing. Arrays obtained from grid_state or previous_state are therefore overwritten two steps later.
+    rollout() and arollout() always yield copies for that reason, their copy argument is ignored.
+
+    Attributes
+    ----------
+    grid_state : np.ndarray
+        Current state of grid of cells.
+    previous_state : np.ndarray
+        State one step before grid_state in the current direction of time.
+    direction : int
+        1 while running forwards in time, -1 after reverse(), when each step decrements generation.
+    """
+
+    def __init__(
+        self,
+        grid_state: ArrayLike,
+        previous_state: ArrayLike | None = None,
+        survive_set: set = {2, 3},
+        birth_set: set = {3},
+        engine: str = "auto"
+    ):
+        super().__init__(grid_state, survive_set, birth_set, engine=engine)
+
+        # An all dead previous state makes the first step a plain first-order step
+        if previous_state is None:
+            previous_state: np.ndarray = np.zeros_like(self.grid_state)
+        else:
+            previous_state: np.ndarray = _normalize_grid_state(previous_state, dtype=self.grid_state.dtype)
+        if previous_state.shape != self.grid_state.shape:
+            raise ValueError(f"previous_state must have the same shape as grid_state. Received {previous_state.shape} and {self.grid_state.shape}.")
+
+        self.previous_state: np.ndarray = previous_state
+        self.direction: int = 1
+        # Third buffer the next state is written into before the rotation
+        self._next_state: np.ndarray = np.empty_like(self.grid_state)
+        # Scratch buffers for the NumPy engine: the grid with a one cell wrapped border, and rule table indices
+        num_rows, num_cols = self.grid_state.shape
+        self._padded_state: np.ndarray = np.empty((num_rows + 2, num_cols + 2), dtype=self.grid_state.dtype)
+        self._rule_index: np.ndarray = np.empty(self.grid_state.shape, dtype=np.intp)
+
+
+    def step(
+        self,
+        n: int = 1
+    ):
+        """
+        Applies n second-order steps in the current direction of time.
+
+        Parameters
+        ----------
+        n : int
+            Number of steps to apply.
+        """
+
+        if not isinstance(n, (int, np.integer)):
+            raise TypeError(f"Number of steps must be an integer. Received {type(n).__name__}.")
+        if n < 0:
+            raise ValueError(f"Cannot apply a negative number of steps. Received {n}.")
+
+        for _ in range(n):
+            self._step_once()
+
+
+    def _step_once(self):
+        """
+        Helper function for step(). Writes the next state into the spare buffer, then rotates
+        previous <- current <- next <- previous without copying.
+        """
+
+        if self.engine == "numba":
+            rule_table: np.ndarray = self.rule.table.astype(self.grid_state.dtype, copy=False)
+            fused_second_order_step(self.grid_state, self.previous_state, rule_table, self._next_state)
+        else:
+            self._step_numpy_into()
+
+        self.previous_state, self.grid_state, self._next_state = self.grid_state, self._next_state, self.previous_state
+        self.generation += self.direction
+
+
+    def _step_numpy_into(self):
+        """
+        Helper function for _step_once(). Writes the next state into the spare buffer with NumPy,
+        using the scratch buffers instead of convolve2d() and fancy indexing so no temporaries are allocated.
+        """
+
+        # Copy the grid into the middle of the padded buffer and wrap the border for the toroidal topology
+        padded: np.ndarray = self._padded_state
+        padded[1:-1, 1:-1] = self.grid_state
+        padded[0, 1:-1] = self.grid_state[-1]
+        padded[-1, 1:-1] = self.grid_state[0]
+        padded[:, 0] = padded[:, -2]
+        padded[:, -1] = padded[:, 1]
+
+        # Sum the 8 shifted views of the padded grid into the neighbor counts
+        rule_index: np.ndarray = self._rule_index
+        num_rows, num_cols = self.grid_state.shape
+        rule_index.fill(0)
+        for row_offset in range(3):
+            for col_offset in range(3):
+                if row_offset != 1 or col_offset != 1:
+                    np.add(rule_index, padded[row_offset:row_offset + num_rows, col_offset:col_offset + num_cols], out=rule_index)
+
+        # Index the flattened rule table by current state * 9 + neighbor count, the spare buffer holds the scaled state
+        rule_table: np.ndarray = self.rule.table.astype(self.grid_state.dtype, copy=False).ravel()
+        np.multiply(self.grid_state, MAX_NEIGHBORS + 1, out=self._next_state)
+        np.add(rule_index, self._next_state, out=rule_index)
+        # Indices are always in range, mode="clip" lets np.take write straight into out without buffering
+        np.take(rule_table, rule_index, out=self._next_state, mode="clip")
+        np.bitwise_xor(self._next_state, self.previous_state, out=self._next_state)
+
+
+    def _frame(
+        self,
+        copy: bool
+    ) -> np.ndarray:
+        """
+        Helper function for rollout() and arollout().
+        Always returns a copy, since the buffer behind grid_state is overwritten two steps later.
+        """
+
+        return self.grid_state.copy()
+
+
+    def reverse(self):
+        """
+        Reverses the direction of time by swapping the previous and current states.
+        The current state becomes the previous generation, and stepping afterwards retraces the earlier states.
+        """
+
+        self.previous_state, self.grid_state = self.grid_state, self.previous_state
+        self.generation -= self.direction
+        self.direction: int = -self.direction
+
+
+    def step_back(
+        self,
+        n: int = 1
+    ):
+        """
+        Undoes n steps, restoring the states n generations earlier in the current direction of time.
+
+        Parameters
+        ----------
+        n : int
+            Number of steps to undo.
+        """
+
+        self.reverse()
+        try:
+            self.step(n)
+        finally:
+            self.reverse()
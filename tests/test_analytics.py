@@ -0,0 +1,79 @@
+import pytest
+import numpy as np
+from numpy.random import Generator
+
+from sim import CellularAutomaton
+from starting_states import START_OPTIONS
+from analytics import PATTERNS, PopulationTracker, census, density_map
+
+
+# Fixes random grids so tests are deterministic
+RANDOM_SEED: int = 42
+RNG: Generator = np.random.default_rng(RANDOM_SEED)
+RANDOM_GRID: np.ndarray = (RNG.random((30, 41)) < 0.3).astype(int)
+
+
+# --- Testing Density Maps ---
+
+@pytest.mark.parametrize("block", [1, 4, 7])
+def test_density_map(block):
+    densities: np.ndarray = density_map(RANDOM_GRID, block)
+    assert densities.shape == (30 // block, 41 // block)
+    for row in range(densities.shape[0]):
+        for col in range(densities.shape[1]):
+            cells: np.ndarray = RANDOM_GRID[row * block:(row + 1) * block, col * block:(col + 1) * block]
+            assert densities[row, col] == pytest.approx(cells.mean())
+
+
+# --- Testing Pattern Census ---
+
+@pytest.mark.parametrize(
+    "start_choice, expected",
+    [("classic_shapes", {"block": 1, "tub": 1, "blinker": 1, "toad": 1}), ("gliders", {"glider": 3}), ("nothing", {})]
+)
+def test_census_starting_states(start_choice, expected):
+    counts: dict[str, int] = census(START_OPTIONS[start_choice])
+    assert counts == {name: expected.get(name, 0) for name in PATTERNS}
+
+
+# Test that every pattern is found in every phase and orientation, including across the toroidal edges
+@pytest.mark.parametrize("name", list(PATTERNS.keys()))
+@pytest.mark.parametrize("rotation", [0, 1, 2, 3])
+@pytest.mark.parametrize("shift", [(0, 0), (-3, -2)])
+def test_census_finds_each_pattern(name, rotation, shift):
+    pattern, period = PATTERNS[name]
+    grid_state: np.ndarray = np.zeros((16, 16), dtype=int)
+    grid_state[5:5 + pattern.shape[0], 5:5 + pattern.shape[1]] = pattern
+    grid_state: np.ndarray = np.roll(np.rot90(grid_state, rotation), shift, axis=(0, 1))
+    ca: CellularAutomaton = CellularAutomaton(grid_state)
+    for _, state in ca.rollout(period):
+        counts: dict[str, int] = census(state)
+        assert counts[name] == 1
+        assert sum(counts.values()) == 1
+
+
+# Test that patterns touching other living cells are not counted
+def test_census_requires_isolation():
+    grid_state: np.ndarray = np.zeros((10, 10), dtype=int)
+    grid_state[3:5, 3:5] = 1
+    grid_state[5, 5] = 1
+    assert census(grid_state)["block"] == 0
+
+
+# --- Testing Population Tracker ---
+
+def test_tracker_samples_every_k():
+    tracker: PopulationTracker = PopulationTracker(every=4, block=4)
+    frames: list[tuple[int, np.ndarray]] = list(tracker.watch(CellularAutomaton(START_OPTIONS["gliders"]).rollout(20)))
+    assert len(frames) == 21
+    summary: dict = tracker.summary()
+    np.testing.assert_array_equal(summary["generations"], [0, 4, 8, 12, 16, 20])
+    np.testing.assert_array_equal(summary["populations"], [15] * 6)
+    np.testing.assert_array_equal(summary["censuses"]["glider"], [3] * 6)
+    assert summary["density_maps"].shape == (6, 4, 4)
+
+
+@pytest.mark.parametrize("kwargs", [{"every": 0}, {"block": 0}])
+def test_tracker_invalid(kwargs):
+    with pytest.raises(ValueError):
+        PopulationTracker(**kwargs)
@@ -0,0 +1,151 @@
+import pytest
+import json
+import numpy as np
+from numpy.random import Generator
+
+import sim
+from sim import CellularAutomaton, SecondOrderCellularAutomaton
+import checkpoint
+from checkpoint import Checkpointer, save_checkpoint, load_checkpoint
+
+
+# Fixes random grids and asynchronous updating so tests are deterministic
+RANDOM_SEED: int = 42
+RNG: Generator = np.random.default_rng(RANDOM_SEED)
+RANDOM_GRID: np.ndarray = (RNG.random((19, 23)) < 0.4).astype(int)
+
+
+def _make_ca(
+    update_rate: float,
+    bit_generator: type = np.random.PCG64
+) -> CellularAutomaton:
+    """
+    Helper function that builds the same seeded CA for every call.
+    """
+
+    return CellularAutomaton(
+        RANDOM_GRID,
+        survive_set={2, 3},
+        birth_set={3, 6},
+        update_rate=update_rate,
+        rng=Generator(bit_generator(RANDOM_SEED))
+    )
+
+
+# Test that restoring mid-run continues bit-identically to an uninterrupted run
+@pytest.mark.parametrize("update_rate", [1.0, 0.5])
+@pytest.mark.parametrize("bit_generator", [np.random.PCG64, np.random.MT19937])
+def test_resume_is_bit_identical(tmp_path, update_rate, bit_generator):
+    uninterrupted: CellularAutomaton = _make_ca(update_rate, bit_generator)
+    for _ in range(20):
+        uninterrupted.step()
+
+    interrupted: CellularAutomaton = _make_ca(update_rate, bit_generator)
+    for _ in range(7):
+        interrupted.step()
+    save_checkpoint(interrupted, tmp_path / "run.ckpt")
+
+    resumed: CellularAutomaton = load_checkpoint(tmp_path / "run.ckpt")
+    assert resumed.generation == 7
+    assert resumed.survive_set == {2, 3} and resumed.birth_set == {3, 6}
+    for _ in range(13):
+        resumed.step()
+    np.testing.assert_array_equal(resumed.grid_state, uninterrupted.grid_state)
+    assert resumed.rng.random() == uninterrupted.rng.random()
+
+
+# Test that a CA without an RNG round trips
+def test_checkpoint_without_rng(tmp_path):
+    ca: CellularAutomaton = CellularAutomaton(RANDOM_GRID)
+    save_checkpoint(ca, tmp_path / "run.ckpt")
+    resumed: CellularAutomaton = load_checkpoint(tmp_path / "run.ckpt")
+    assert resumed.rng is None
+    np.testing.assert_array_equal(resumed.grid_state, RANDOM_GRID)
+
+
+# Test that bit generator names read from a file are checked before anything is instantiated
+@pytest.mark.parametrize("bit_generator_name", ["SeedSequence", "default_rng", "__import__", None])
+def test_load_rejects_unknown_bit_generator(tmp_path, bit_generator_name):
+    save_checkpoint(_make_ca(0.5), tmp_path / "run.ckpt")
+    with np.load(tmp_path / "run.ckpt") as checkpoint:
+        arrays: dict = dict(checkpoint)
+    rng_state: dict = json.loads(str(arrays["rng_state"]))
+    rng_state["bit_generator"] = bit_generator_name
+    arrays["rng_state"] = np.array(json.dumps(rng_state))
+    with open(tmp_path / "tampered.ckpt", "wb") as file:
+        np.savez_compressed(file, **arrays)
+    with pytest.raises(ValueError):
+        load_checkpoint(tmp_path / "tampered.ckpt")
+
+
+# Test that planned execution settings survive a resume instead of falling back to the defaults
+@pytest.mark.parametrize("engine", ["numpy", "auto"])
+def test_resume_keeps_execution_settings(tmp_path, engine):
+    ca: CellularAutomaton = CellularAutomaton(RANDOM_GRID, engine=engine, tile_size=8, block_steps=4, dtype=np.uint8)
+    ca.step(5)
+    save_checkpoint(ca, tmp_path / "run.ckpt")
+    resumed: CellularAutomaton = load_checkpoint(tmp_path / "run.ckpt")
+    assert resumed.grid_state.dtype == np.uint8
+    assert (resumed.engine, resumed.tile_size, resumed.block_steps) == (ca.engine, 8, 4)
+    ca.step(9)
+    resumed.step(9)
+    np.testing.assert_array_equal(resumed.grid_state, ca.grid_state)
+
+
+# Test that a run saved with the Numba engine resumes with NumPy where Numba is not installed
+def test_resume_numba_without_numba(tmp_path, monkeypatch):
+    if not sim.NUMBA_AVAILABLE:
+        pytest.skip("Saving a Numba run needs Numba")
+    save_checkpoint(CellularAutomaton(RANDOM_GRID, engine="numba"), tmp_path / "run.ckpt")
+    monkeypatch.setattr(checkpoint, "NUMBA_AVAILABLE", False)
+    monkeypatch.setattr(sim, "NUMBA_AVAILABLE", False)
+    assert load_checkpoint(tmp_path / "run.ckpt").engine == "numpy"
+
+
+# Test that checkpoints written before the execution settings were stored still load, with the defaults
+def test_load_version_1(tmp_path):
+    save_checkpoint(_make_ca(0.5), tmp_path / "run.ckpt")
+    with np.load(tmp_path / "run.ckpt") as checkpoint:
+        arrays: dict = {key: value for key, value in checkpoint.items() if key not in ("dtype", "engine", "tile_size", "block_steps")}
+    arrays["version"] = np.array(1)
+    with open(tmp_path / "old.ckpt", "wb") as file:
+        np.savez_compressed(file, **arrays)
+    resumed: CellularAutomaton = load_checkpoint(tmp_path / "old.ckpt")
+    assert resumed.grid_state.dtype == np.dtype(int)
+    np.testing.assert_array_equal(resumed.grid_state, RANDOM_GRID)
+
+
+# Test that the directory is flushed after the rename so the new checkpoint survives a crash
+def test_save_fsyncs_directory(tmp_path, monkeypatch):
+    flushed: list[str] = []
+    monkeypatch.setattr(checkpoint, "_fsync_directory", flushed.append)
+    save_checkpoint(_make_ca(1.0), tmp_path / "run.ckpt")
+    assert flushed == [str(tmp_path)]
+
+
+def test_second_order_not_checkpointed(tmp_path):
+    with pytest.raises(TypeError):
+        save_checkpoint(SecondOrderCellularAutomaton(RANDOM_GRID), tmp_path / "run.ckpt")
+
+
+# Test that background checkpoints capture the state at the time of saving, not the time of writing
+def test_checkpointer_saves_every(tmp_path):
+    ca: CellularAutomaton = _make_ca(0.5)
+    path: str = str(tmp_path / "run.ckpt")
+    expected: np.ndarray | None = None
+    with Checkpointer(path, every=4) as checkpointer:
+        for _, grid_state in ca.rollout(10, copy=True):
+            checkpointer.maybe_save(ca)
+            if ca.generation == 8:
+                expected = grid_state
+    resumed: CellularAutomaton = load_checkpoint(path)
+    assert resumed.generation == 8
+    np.testing.assert_array_equal(resumed.grid_state, expected)
+    # Only the final checkpoint should remain, no temporary files
+    assert [file.name for file in tmp_path.iterdir()] == ["run.ckpt"]
+
+
+@pytest.mark.parametrize("every", [0, -1])
+def test_checkpointer_invalid_every(tmp_path, every):
+    with pytest.raises(ValueError):
+        Checkpointer(str(tmp_path / "run.ckpt"), every=every)
@@ -0,0 +1,102 @@
+import pytest
+import shutil
+import struct
+import zlib
+import numpy as np
+from numpy.random import Generator
+
+from sim import CellularAutomaton
+from export import auto_cell_size, upscale, encode_png, export_png_frames, export_gif, export_video
+
+
+# Fixes random grids so tests are deterministic
+RANDOM_SEED: int = 42
+RNG: Generator = np.random.default_rng(RANDOM_SEED)
+RANDOM_GRID: np.ndarray = (RNG.random((13, 21)) < 0.4).astype(int)
+
+
+def _decode_png(
+    png: bytes
+) -> np.ndarray:
+    """
+    Helper function that decodes the 1-bit grayscale PNGs written by encode_png().
+    """
+
+    assert png[:8] == b"\x89PNG\r\n\x1a\n"
+    position: int = 8
+    chunks: dict[bytes, bytes] = {}
+    while position < len(png):
+        length, chunk_type = struct.unpack(">I4s", png[position:position + 8])
+        chunks[chunk_type] = png[position + 8:position + 8 + length]
+        position += length + 12
+    width, height, bit_depth, color_type = struct.unpack(">IIBB", chunks[b"IHDR"][:10])
+    assert (bit_depth, color_type) == (1, 0)
+    scanlines: np.ndarray = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype=np.uint8).reshape(height, -1)
+    # Every row uses filter type 0
+    assert (scanlines[:, 0] == 0).all()
+    return np.unpackbits(scanlines[:, 1:], axis=1, count=width).astype(bool)
+
+
+# Test that each cell becomes a cell_size x cell_size block
+@pytest.mark.parametrize("cell_size", [1, 2, 5])
+def test_upscale(cell_size):
+    image: np.ndarray = upscale(RANDOM_GRID, cell_size)
+    assert image.shape == (13 * cell_size, 21 * cell_size)
+    np.testing.assert_array_equal(image, np.kron(RANDOM_GRID, np.ones((cell_size, cell_size), dtype=int)).astype(bool))
+
+
+# Test that small boards are enlarged and large boards get one pixel per cell
+@pytest.mark.parametrize("shape, cell_size", [((17, 17), 8), ((100, 200), 5), ((512, 512), 2), ((1000, 1000), 1), ((8192, 64), 1)])
+def test_auto_cell_size(shape, cell_size):
+    assert auto_cell_size(shape) == cell_size
+    grid_state: np.ndarray = np.zeros(shape, dtype=int)
+    assert upscale(grid_state).shape == (shape[0] * cell_size, shape[1] * cell_size)
+
+
+@pytest.mark.parametrize("cell_size", [0, -2])
+def test_upscale_invalid_cell_size(cell_size):
+    with pytest.raises(ValueError):
+        upscale(RANDOM_GRID, cell_size)
+
+
+# Test that PNGs decode back to the original image, including widths that are not a multiple of 8
+@pytest.mark.parametrize("cell_size", [1, 3])
+def test_encode_png_round_trip(cell_size):
+    image: np.ndarray = upscale(RANDOM_GRID, cell_size)
+    np.testing.assert_array_equal(_decode_png(encode_png(image)), image)
+
+
+# Test that rollouts and recorded trajectories both export in order
+def test_export_png_frames(tmp_path):
+    ca: CellularAutomaton = CellularAutomaton(RANDOM_GRID)
+    expected: list[np.ndarray] = [state for _, state in ca.rollout(9, stride=3, copy=True)]
+
+    ca: CellularAutomaton = CellularAutomaton(RANDOM_GRID)
+    paths: list[str] = export_png_frames(ca.rollout(9, stride=3), tmp_path / "rollout", cell_size=2, workers=3)
+    assert [path.rsplit("_", 1)[1] for path in paths] == ["000000.png", "000003.png", "000006.png", "000009.png"]
+    for path, state in zip(paths, expected):
+        with open(path, "rb") as png_file:
+            np.testing.assert_array_equal(_decode_png(png_file.read()), upscale(state, 2))
+
+    trajectory: np.ndarray = np.stack(expected)
+    paths: list[str] = export_png_frames(trajectory, tmp_path / "trajectory", cell_size=1)
+    assert len(paths) == len(expected)
+
+
+def test_export_gif(tmp_path):
+    pytest.importorskip("PIL")
+    ca: CellularAutomaton = CellularAutomaton(RANDOM_GRID)
+    export_gif(ca.rollout(5), tmp_path / "rollout.gif", cell_size=2)
+    assert (tmp_path / "rollout.gif").stat().st_size > 0
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+def test_export_video(tmp_path):
+    ca: CellularAutomaton = CellularAutomaton(RANDOM_GRID)
+    export_video(ca.rollout(5), str(tmp_path / "rollout.mp4"), cell_size=3)
+    assert (tmp_path / "rollout.mp4").stat().st_size > 0
+
+
+def test_export_video_missing_ffmpeg(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        export_video([RANDOM_GRID], str(tmp_path / "rollout.mp4"), ffmpeg="not-a-real-ffmpeg")
@@ -1,7 +1,8 @@
 import pytest
+import numpy as np
 from typing import Dict, Any
 
-from validation import validate_inputs, VALID_START_OPTIONS
+from validation import validate_inputs, validate_batch, VALID_START_OPTIONS
 
 
 # Establish base set of valid parameters
@@ -30,12 +31,23 @@ INVALID_START_CHOICES: list[Any] = ["RANDOM", "Randomize", 123, None, True]
 VALID_UPDATE_RATES: list[float] = [0.0, 0.1, 0.99, 1.0]
 INVALID_UPDATE_RATES: list[Any] = [1.1, -0.2, 10, None, "0.8"]
 
-VALID_SEEDS: list[int|None] = [1, None]
-INVALID_SEEDS: list[Any] = [0.5, "None", "42"]
+VALID_SEEDS: list[int|None] = [1, None, 0, np.int64(7)]
+INVALID_SEEDS: list[Any] = [0.5, "None", "42", -1]
 
 VALID_SECONDS_PER_STEP: list[float] = [0.1, 5.0]
 INVALID_SECONDS_PER_STEP: list[Any] = [-0.1, 0.0, None, "0.8"]
 
+VALID_CHECKPOINT_EVERY: list[int] = [1, 100]
+INVALID_CHECKPOINT_EVERY: list[Any] = [0, -5, 2.5, None]
+
+VALID_DISPLAYS: list[str] = ["grid", "half", "braille"]
+INVALID_DISPLAYS: list[Any] = ["Braille", "", None, 1]
+
+VALID_ZOOMS: list[int|None] = [None, 1, 16]
+INVALID_ZOOMS: list[Any] = [0, -2, 1.5, "2"]
+VALID_PLANNER_LIMITS: list[Dict[str, Any]] = [{"memory_cap": None, "threads": None}, {"memory_cap": 4096, "threads": 1}, {"memory_cap": 1, "threads": 64}]
+INVALID_PLANNER_LIMITS: list[Dict[str, Any]] = [{"memory_cap": 0}, {"memory_cap": 1.5}, {"memory_cap": "4096"}, {"threads": 0}, {"threads": -1}, {"threads": 2.0}]
+
 
 # --- Testing Validation Function with Valid and Invalid Inputs ---
 
@@ -126,4 +138,77 @@ def test_invalid_seconds_per_step(seconds_per_step):
     with pytest.raises((TypeError, ValueError)):
         test_params: Dict[str, Any] = VALID_BASE.copy()
         test_params.update({"seconds_per_step": seconds_per_step})
-        validate_inputs(**test_params)
\ No newline at end of file
+        validate_inputs(**test_params)
+
+
+# -- Testing Checkpoint Interval Options --
+@pytest.mark.parametrize("checkpoint_every", VALID_CHECKPOINT_EVERY)
+def test_valid_checkpoint_every(checkpoint_every):
+    test_params: Dict[str, Any] = VALID_BASE.copy()
+    test_params.update({"checkpoint_every": checkpoint_every})
+    validate_inputs(**test_params)
+
+@pytest.mark.parametrize("checkpoint_every", INVALID_CHECKPOINT_EVERY)
+def test_invalid_checkpoint_every(checkpoint_every):
+    with pytest.raises((TypeError, ValueError)):
+        test_params: Dict[str, Any] = VALID_BASE.copy()
+        test_params.update({"checkpoint_every": checkpoint_every})
+        validate_inputs(**test_params)
+
+
+# -- Testing Display Options --
+@pytest.mark.parametrize("display", VALID_DISPLAYS)
+def test_valid_displays(display):
+    test_params: Dict[str, Any] = VALID_BASE.copy()
+    test_params.update({"display": display})
+    validate_inputs(**test_params)
+
+@pytest.mark.parametrize("display", INVALID_DISPLAYS)
+def test_invalid_displays(display):
+    with pytest.raises((TypeError, ValueError)):
+        test_params: Dict[str, Any] = VALID_BASE.copy()
+        test_params.update({"display": display})
+        validate_inputs(**test_params)
+
+
+# -- Testing Zoom Options --
+@pytest.mark.parametrize("zoom", VALID_ZOOMS)
+def test_valid_zooms(zoom):
+    test_params: Dict[str, Any] = VALID_BASE.copy()
+    test_params.update({"zoom": zoom})
+    validate_inputs(**test_params)
+
+@pytest.mark.parametrize("zoom", INVALID_ZOOMS)
+def test_invalid_zooms(zoom):
+    with pytest.raises((TypeError, ValueError)):
+        test_params: Dict[str, Any] = VALID_BASE.copy()
+        test_params.update({"zoom": zoom})
+        validate_inputs(**test_params)
+
+
+# -- Testing Planner Limits --
+@pytest.mark.parametrize("limits", VALID_PLANNER_LIMITS)
+def test_valid_planner_limits(limits):
+    test_params: Dict[str, Any] = VALID_BASE.copy()
+    test_params.update(limits)
+    validate_inputs(**test_params)
+
+@pytest.mark.parametrize("limits", INVALID_PLANNER_LIMITS)
+def test_invalid_planner_limits(limits):
+    with pytest.raises((TypeError, ValueError)):
+        test_params: Dict[str, Any] = VALID_BASE.copy()
+        test_params.update(limits)
+        validate_inputs(**test_params)
+
+
+# --- Testing Batch Validation ---
+
+# Test that every invalid job is reported by index without stopping at the first one
+def test_validate_batch():
+    jobs: list[Dict[str, Any]] = [VALID_BASE.copy() for _ in range(5)]
+    jobs[1].update({"rule_string": "S9B3"})
+    jobs[3].update({"seed": "42"})
+    errors: Dict[int, Exception] = validate_batch(jobs)
+    assert sorted(errors) == [1, 3]
+    assert isinstance(errors[1], Warning) and isinstance(errors[3], TypeError)
+    assert validate_batch(jobs[::2]) == {}
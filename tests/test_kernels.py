@@ -0,0 +1,103 @@
+import pytest
+import numpy as np
+from numpy.random import Generator
+
+import sim
+from sim import CellularAutomaton
+from kernels import make_rule_table
+
+
+# Fixes random grids and asynchronous updating so tests are deterministic
+RANDOM_SEED: int = 42
+RNG: Generator = np.random.default_rng(RANDOM_SEED)
+
+# Grid shapes including single rows and columns where neighbors wrap onto the cell itself
+SHAPES: list[tuple[int, int]] = [(17, 17), (1, 9), (9, 1), (2, 3), (64, 45)]
+RULES: list[tuple[set, set]] = [({2, 3}, {3}), ({1, 2, 3, 8}, {1, 2, 3, 7, 8}), (set(), set()), ({0}, {0, 5})]
+
+
+# Test that the table reproduces the survival and birth sets
+def test_make_rule_table():
+    rule_table: np.ndarray = make_rule_table({2, 3}, {3, 9})
+    np.testing.assert_array_equal(rule_table[1], [0, 0, 1, 1, 0, 0, 0, 0, 0])
+    np.testing.assert_array_equal(rule_table[0], [0, 0, 0, 1, 0, 0, 0, 0, 0])
+
+
+# Test that the fused kernel is bit-identical to the reference NumPy step
+@pytest.mark.parametrize("shape", SHAPES)
+@pytest.mark.parametrize("survive_set, birth_set", RULES)
+@pytest.mark.parametrize("update_rate", [1.0, 0.6, 0.0])
+def test_fused_step_matches_numpy(shape, survive_set, birth_set, update_rate):
+    pytest.importorskip("numba")
+    grid_state: np.ndarray = (RNG.random(shape) < 0.4).astype(int)
+    cas: list[CellularAutomaton] = [
+        CellularAutomaton(
+            grid_state,
+            survive_set=survive_set,
+            birth_set=birth_set,
+            update_rate=update_rate,
+            rng=np.random.default_rng(RANDOM_SEED),
+            engine=engine
+        )
+        for engine in ("numpy", "numba")
+    ]
+    for _ in range(12):
+        for ca in cas:
+            ca.step()
+        np.testing.assert_array_equal(cas[1].grid_state, cas[0].grid_state)
+    # Both engines must leave the RNG in the same state for later steps to stay identical
+    assert cas[0].rng.random() == cas[1].rng.random()
+
+
+def test_auto_engine(monkeypatch):
+    assert CellularAutomaton(np.zeros((3, 3))).engine == ("numba" if sim.NUMBA_AVAILABLE else "numpy")
+    monkeypatch.setattr(sim, "NUMBA_AVAILABLE", False)
+    assert CellularAutomaton(np.zeros((3, 3))).engine == "numpy"
+    with pytest.raises(ImportError):
+        CellularAutomaton(np.zeros((3, 3)), engine="numba")
+
+
+def test_invalid_engine():
+    with pytest.raises(ValueError):
+        CellularAutomaton(np.zeros((3, 3)), engine="cuda")
+
+
+# --- Testing Temporal Blocking ---
+
+# Test that advancing n steps at once matches n single steps, including grids smaller than the halo
+@pytest.mark.parametrize("shape", SHAPES + [(300, 257)])
+@pytest.mark.parametrize("survive_set, birth_set", RULES)
+@pytest.mark.parametrize("tile_size, block_steps", [(16, 4), (7, 3), (256, 8)])
+def test_blocked_steps_match_single_steps(shape, survive_set, birth_set, tile_size, block_steps):
+    grid_state: np.ndarray = (RNG.random(shape) < 0.4).astype(int)
+    single: CellularAutomaton = CellularAutomaton(grid_state, survive_set=survive_set, birth_set=birth_set, engine="numpy")
+    blocked: CellularAutomaton = CellularAutomaton(
+        grid_state,
+        survive_set=survive_set,
+        birth_set=birth_set,
+        engine="numpy",
+        tile_size=tile_size,
+        block_steps=block_steps
+    )
+    for _ in range(11):
+        single.step()
+    blocked.step(11)
+    np.testing.assert_array_equal(blocked.grid_state, single.grid_state)
+    assert blocked.grid_state.dtype == single.grid_state.dtype
+    assert blocked.generation == 11
+
+
+# Test that asynchronous updates still consume the RNG one full step at a time
+def test_step_n_asynchronous():
+    grid_state: np.ndarray = (RNG.random((20, 20)) < 0.4).astype(int)
+    single: CellularAutomaton = CellularAutomaton(grid_state, update_rate=0.5, rng=np.random.default_rng(RANDOM_SEED), engine="numpy")
+    multi: CellularAutomaton = CellularAutomaton(grid_state, update_rate=0.5, rng=np.random.default_rng(RANDOM_SEED), engine="numpy")
+    for _ in range(6):
+        single.step()
+    multi.step(6)
+    np.testing.assert_array_equal(multi.grid_state, single.grid_state)
+
+
+def test_step_negative():
+    with pytest.raises(ValueError):
+        CellularAutomaton(np.zeros((3, 3))).step(-1)
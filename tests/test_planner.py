@@ -0,0 +1,207 @@
+import pytest
+import json
+import pathlib
+import tracemalloc
+import numpy as np
+from typing import Any, Dict
+
+import planner
+from planner import Plan, calibrate, load_calibration, plan_run
+from kernels import NUMBA_AVAILABLE
+from sim import CellularAutomaton
+from starting_states import START_OPTIONS
+
+
+# Measurements with round numbers so the planner's choices are known in advance
+SYNTHETIC_CALIBRATION: Dict[str, Any] = {
+    "fingerprint": {"machine": "test", "cpu_count": 4},
+    "created": "2026-01-01T00:00:00+00:00",
+    "grid_size": 384,
+    "measurements": {
+        "numpy/uint8/sync": {"bytes_per_cell": 20.0, "cells_per_second": 1e7},
+        "numpy/int64/sync": {"bytes_per_cell": 60.0, "cells_per_second": 1e7},
+        "numpy-blocked/uint8/sync": {"bytes_per_cell": 4.0, "cells_per_second": 4e8, "tile_size": 128},
+        "numpy-blocked/int64/sync": {"bytes_per_cell": 16.0, "cells_per_second": 5e8, "tile_size": 256},
+        "numba/uint8/sync": {"bytes_per_cell": 2.0, "cells_per_second": 1e8, "cells_per_second_all_threads": 3e8, "max_threads": 4},
+        "numba/int64/sync": {"bytes_per_cell": 16.0, "cells_per_second": 1e8, "cells_per_second_all_threads": 3e8, "max_threads": 4},
+        "numpy/uint8/async": {"bytes_per_cell": 30.0, "cells_per_second": 5e6},
+        "numpy/int64/async": {"bytes_per_cell": 90.0, "cells_per_second": 5e6},
+        "numba/uint8/async": {"bytes_per_cell": 12.0, "cells_per_second": 5e7, "cells_per_second_all_threads": 2e8, "max_threads": 4},
+        "numba/int64/async": {"bytes_per_cell": 30.0, "cells_per_second": 5e7, "cells_per_second_all_threads": 2e8, "max_threads": 4}
+    }
+}
+SHAPE: tuple[int, int] = (1000, 1000)
+
+
+@pytest.fixture
+def with_numba(monkeypatch):
+    """
+    Makes the planner consider the Numba strategy and thread counts whether or not Numba is installed.
+    """
+
+    monkeypatch.setattr(planner, "NUMBA_AVAILABLE", True)
+    monkeypatch.setattr(planner, "_max_threads", lambda: 4)
+
+
+@pytest.fixture
+def restore_threads():
+    """
+    Restores Numba's thread count after a test builds a plan, which sets it for the whole process.
+    """
+
+    default_threads: int | None = planner.numba.get_num_threads() if planner.NUMBA_AVAILABLE else None
+    yield
+    if default_threads is not None:
+        planner.numba.set_num_threads(default_threads)
+
+
+# --- Testing Strategy Choice ---
+
+@pytest.mark.parametrize(
+    "update_rate, memory_cap, threads, strategy, dtype, expected_threads",
+    [
+        (1.0, None, None, "numpy-blocked", "int64", 1),
+        (1.0, 10e6, None, "numpy-blocked", "uint8", 1),
+        (1.0, 3e6, None, "numba", "uint8", 4),
+        (1.0, None, 1, "numpy-blocked", "int64", 1),
+        (0.5, None, None, "numba", "uint8", 4),
+        (0.5, None, 2, "numba", "uint8", 2),
+        (0.5, 20e6, None, "numba", "uint8", 4)
+    ]
+)
+def test_plan_choice(with_numba, update_rate, memory_cap, threads, strategy, dtype, expected_threads):
+    plan: Plan = plan_run(SHAPE, 100, update_rate, memory_cap, threads, SYNTHETIC_CALIBRATION)
+    assert (plan.strategy, plan.dtype.name, plan.threads) == (strategy, dtype, expected_threads)
+    if memory_cap is not None:
+        assert plan.estimated_bytes <= memory_cap
+
+
+# Test that exactly one candidate is chosen and every other one says why not
+def test_plan_candidates(with_numba):
+    plan: Plan = plan_run(SHAPE, 100, 1.0, 10e6, None, SYNTHETIC_CALIBRATION)
+    assert len(plan.candidates) == 6
+    rejected: list[str | None] = [candidate["rejected"] for candidate in plan.candidates]
+    assert rejected.count(None) == 1
+    assert {"exceeds memory cap", "slower"} <= set(rejected)
+
+
+def test_plan_blocking_needs_steps(with_numba):
+    plan: Plan = plan_run(SHAPE, 1, 1.0, None, None, SYNTHETIC_CALIBRATION)
+    assert plan.strategy == "numba"
+    assert plan.block_steps == 1
+
+
+# Test that a calibration measured with more threads than this process has is capped to the process
+def test_plan_threads_capped_by_process(monkeypatch, restore_threads):
+    monkeypatch.setattr(planner, "NUMBA_AVAILABLE", True)
+    monkeypatch.setattr(planner, "_max_threads", lambda: 1)
+    plan: Plan = plan_run(SHAPE, 100, 0.5, None, 4, SYNTHETIC_CALIBRATION)
+    assert (plan.strategy, plan.threads) == ("numba", 1)
+    assert all(candidate["threads"] == 1 for candidate in plan.candidates)
+    if not NUMBA_AVAILABLE:
+        pytest.skip("Building the plan needs Numba")
+    assert plan.build(START_OPTIONS["gliders"], rng=np.random.default_rng(0)).engine == "numba"
+
+
+def test_plan_without_numba(monkeypatch):
+    monkeypatch.setattr(planner, "NUMBA_AVAILABLE", False)
+    plan: Plan = plan_run(SHAPE, 100, 0.5, None, None, SYNTHETIC_CALIBRATION)
+    assert (plan.strategy, plan.engine, plan.threads) == ("numpy", "numpy", 1)
+    assert all(candidate["strategy"] != "numba" for candidate in plan.candidates)
+
+
+def test_plan_exceeds_memory(with_numba):
+    with pytest.raises(MemoryError):
+        plan_run(SHAPE, 100, 1.0, 1e6, None, SYNTHETIC_CALIBRATION)
+
+
+def test_plan_report(with_numba):
+    report: str = plan_run(SHAPE, 100, 1.0, 10e6, 2, SYNTHETIC_CALIBRATION).report()
+    assert "1000x1000" in report
+    assert "Thread budget: 2" in report
+    assert "Chose numpy-blocked with uint8 cells" in report
+    assert "128x128 tiles" in report
+
+
+# --- Testing Plan Execution ---
+
+# Test that the automaton built from a plan steps to the same states as the default configuration
+@pytest.mark.parametrize("update_rate, memory_cap", [(1.0, None), (1.0, 10e6), (1.0, 3e6), (0.5, None)])
+def test_plan_build_matches_default(restore_threads, update_rate, memory_cap):
+    start: np.ndarray = START_OPTIONS["gliders"]
+    plan: Plan = plan_run(SHAPE, 16, update_rate, memory_cap, None, SYNTHETIC_CALIBRATION)
+    ca: CellularAutomaton = plan.build(start, rng=np.random.default_rng(0))
+    expected: CellularAutomaton = CellularAutomaton(start, update_rate=update_rate, rng=np.random.default_rng(0))
+    assert ca.engine == plan.engine
+    assert ca.grid_state.dtype == plan.dtype
+    ca.step(16)
+    expected.step(16)
+    np.testing.assert_array_equal(ca.grid_state, expected.grid_state)
+
+
+# --- Testing Calibration ---
+
+def test_calibrate():
+    calibration: Dict[str, Any] = calibrate(size=32, steps=2)
+    measurements: Dict[str, Dict[str, Any]] = calibration["measurements"]
+    assert {"numpy/uint8/sync", "numpy-blocked/int64/sync", "numpy/int64/async"} <= set(measurements)
+    assert "numpy-blocked/uint8/async" not in measurements
+    assert all(m["bytes_per_cell"] > 0 and m["cells_per_second"] > 0 for m in measurements.values())
+    # Calibrations are cached as JSON
+    json.dumps(calibration)
+    assert plan_run((64, 64), 10, calibration=calibration).strategy in planner.STRATEGIES
+
+
+# Test that the estimate covers the caller's starting grid, building the automaton and stepping it
+@pytest.mark.parametrize("update_rate", [1.0, 0.5])
+def test_estimate_covers_build_and_steps(restore_threads, update_rate):
+    calibration: Dict[str, Any] = calibrate(size=128, steps=2)
+    start: np.ndarray = (np.random.default_rng(0).random((512, 512)) < 0.3).astype(int)
+    chosen: Plan = plan_run(start.shape, 4, update_rate, None, None, calibration)
+    for candidate in chosen.candidates:
+        plan: Plan = Plan(start.shape, 4, update_rate, None, chosen.thread_budget, calibration, chosen.candidates, candidate)
+        tracemalloc.start()
+        try:
+            plan.build(start, rng=np.random.default_rng(0)).step(4)
+            peak_bytes: int = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        assert start.nbytes + peak_bytes <= plan.estimated_bytes * 1.1
+
+
+# Test that the calibration is measured once, then reused until the machine or libraries change
+def test_load_calibration_cache(monkeypatch, tmp_path):
+    calls: list[int] = []
+    def fake_calibrate() -> Dict[str, Any]:
+        """
+        Stands in for calibrate(), counting calls.
+        """
+
+        calls.append(1)
+        return {**SYNTHETIC_CALIBRATION, "fingerprint": planner._fingerprint()}
+    monkeypatch.setattr(planner, "calibrate", fake_calibrate)
+    path: str = str(tmp_path / "cache" / "calibration.json")
+
+    assert load_calibration(path)["path"] == path
+    assert load_calibration(path)["measurements"] == SYNTHETIC_CALIBRATION["measurements"]
+    assert len(calls) == 1
+    load_calibration(path, recalibrate=True)
+    assert len(calls) == 2
+
+    # A calibration measured with a different Numba thread count is measured again
+    monkeypatch.setattr(planner, "_max_threads", lambda: 64)
+    load_calibration(path)
+    assert len(calls) == 3
+
+    # A calibration from another machine is measured again
+    monkeypatch.setattr(planner, "_fingerprint", lambda: {"machine": "other"})
+    load_calibration(path)
+    assert len(calls) == 4
+
+
+def test_load_calibration_corrupt(monkeypatch, tmp_path):
+    monkeypatch.setattr(planner, "calibrate", lambda: {**SYNTHETIC_CALIBRATION, "fingerprint": planner._fingerprint()})
+    path: pathlib.Path = tmp_path / "calibration.json"
+    path.write_text("{not json")
+    assert load_calibration(str(path))["measurements"] == SYNTHETIC_CALIBRATION["measurements"]
+    assert json.loads(path.read_text())["grid_size"] == 384
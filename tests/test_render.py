@@ -0,0 +1,85 @@
+import pytest
+import numpy as np
+from numpy.random import Generator
+
+from render import Viewport, _render_state
+
+
+# Fixes random grids so tests are deterministic
+RANDOM_SEED: int = 42
+RNG: Generator = np.random.default_rng(RANDOM_SEED)
+RANDOM_GRID: np.ndarray = (RNG.random((37, 53)) < 0.3).astype(int)
+
+
+# --- Testing Glyph Encoding ---
+
+# Test that each braille dot lights the matching bit of the glyph
+@pytest.mark.parametrize(
+    "row, col, glyph",
+    [(0, 0, "⠁"), (1, 0, "⠂"), (2, 0, "⠄"), (3, 0, "⡀"), (0, 1, "⠈"), (1, 1, "⠐"), (2, 1, "⠠"), (3, 1, "⢀")]
+)
+def test_braille_dots(row, col, glyph):
+    grid_state: np.ndarray = np.zeros((4, 2), dtype=int)
+    grid_state[row, col] = 1
+    assert Viewport(1, 1, mode="braille").render(grid_state).plain == glyph
+
+
+def test_half_blocks():
+    grid_state: np.ndarray = np.array([
+        [0, 1, 0, 1],
+        [0, 0, 1, 1]
+    ])
+    assert Viewport(1, 4, mode="half").render(grid_state).plain == " ▀▄█"
+
+
+# Test that the grid mode matches the full render when everything fits
+def test_grid_mode_matches_full_render():
+    viewport: Viewport = Viewport(100, 500, mode="grid")
+    assert viewport.render(RANDOM_GRID).plain == _render_state(RANDOM_GRID).plain
+
+
+# Test that uint8 states, as produced by planned runs, render like int states
+@pytest.mark.parametrize("trusted", [True, False])
+def test_uint8_render(trusted):
+    assert _render_state(RANDOM_GRID.astype(np.uint8), trusted=trusted).plain == _render_state(RANDOM_GRID).plain
+    assert Viewport(100, 500, mode="braille").render(RANDOM_GRID.astype(np.uint8)).plain == Viewport(100, 500, mode="braille").render(RANDOM_GRID).plain
+
+
+# --- Testing Pooling ---
+
+# Test that block-OR pooling and density pooling match a direct computation over the blocks
+@pytest.mark.parametrize("threshold", [0.0, 0.25, 0.5])
+@pytest.mark.parametrize("zoom", [1, 2, 3])
+def test_pooling(zoom, threshold):
+    viewport: Viewport = Viewport(100, 100, mode="half", zoom=zoom, threshold=threshold)
+    pixels: np.ndarray = viewport.pool(RANDOM_GRID)
+    for row in range(pixels.shape[0]):
+        for col in range(pixels.shape[1]):
+            block: np.ndarray = RANDOM_GRID[row * zoom:(row + 1) * zoom, col * zoom:(col + 1) * zoom]
+            assert pixels[row, col] == (block.sum() > threshold * zoom * zoom)
+
+
+# Test that panning wraps around the toroidal grid
+def test_pan_wraps():
+    viewport: Viewport = Viewport(5, 4, mode="braille")
+    viewport.pan(-3, 50)
+    expected: np.ndarray = np.roll(RANDOM_GRID, (3, -50), axis=(0, 1))[:20, :8]
+    np.testing.assert_array_equal(viewport.pool(RANDOM_GRID), expected)
+
+
+# Test that fitting picks the smallest zoom showing the whole grid
+def test_fit():
+    viewport: Viewport = Viewport(10, 20, mode="braille")
+    viewport.fit((2048, 2048))
+    assert viewport.zoom == 52
+    text: str = viewport.render(np.ones((2048, 2048), dtype=int)).plain
+    lines: list[str] = text.split("\n")
+    assert len(lines) <= 10 and max(len(line) for line in lines) <= 20
+    viewport.zoom_in()
+    assert viewport.zoom == 26
+
+
+@pytest.mark.parametrize("kwargs", [{"mode": "ascii"}, {"zoom": 0}, {"threshold": 1.0}])
+def test_invalid_viewport(kwargs):
+    with pytest.raises(ValueError):
+        Viewport(10, 10, **kwargs)
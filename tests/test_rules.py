@@ -0,0 +1,35 @@
+import pytest
+import numpy as np
+from typing import Any
+
+from rules import Rule, parse_rule, rule_from_sets
+
+
+# Test that rule strings parse into the matching sets and tables
+@pytest.mark.parametrize(
+    "rule_string, survive_set, birth_set",
+    [("S23B3", {2, 3}, {3}), ("SB", set(), set()), ("S012345678B0", set(range(9)), {0}), ("S3322B33", {2, 3}, {3})]
+)
+def test_parse_rule(rule_string, survive_set, birth_set):
+    rule: Rule = parse_rule(rule_string)
+    assert rule.survive_set == survive_set and rule.birth_set == birth_set
+    np.testing.assert_array_equal(np.flatnonzero(rule.table[1]), sorted(survive_set))
+    np.testing.assert_array_equal(np.flatnonzero(rule.table[0]), sorted(birth_set))
+
+
+@pytest.mark.parametrize("rule_string", ["S9B9", "S123", "B123", "B12S32", "s23b3", 123, None, True])
+def test_parse_invalid_rule(rule_string: Any):
+    with pytest.raises((TypeError, ValueError, Warning)):
+        parse_rule(rule_string)
+
+
+# Test that equal rules are built once and shared
+def test_rules_are_shared():
+    assert parse_rule("S23B3") is parse_rule("S32B3")
+    assert parse_rule("S23B3") is rule_from_sets({2, 3}, {3})
+    assert parse_rule("S23B3").rule_string == "S23B3"
+
+
+def test_rule_table_read_only():
+    with pytest.raises(ValueError):
+        parse_rule("S23B3").table[0, 0] = 1
@@ -0,0 +1,155 @@
+import pytest
+import json
+import os
+import subprocess
+import sys
+import threading
+import urllib.request
+import numpy as np
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterator
+
+import server
+from server import JobServer, parse_spec
+from frame_codec import encode_frame, decode_frame
+from client import RemoteRun
+from sim import CellularAutomaton
+from starting_states import START_OPTIONS
+
+
+RANDOM_SEED: int = 42
+
+
+@pytest.fixture(scope="module")
+def job_server() -> Iterator[JobServer]:
+    """
+    Serves jobs from one warm worker on a free local port for the tests in this module.
+    """
+
+    job_server: JobServer = JobServer(("127.0.0.1", 0), workers=1)
+    thread: threading.Thread = threading.Thread(target=job_server.serve_forever, daemon=True)
+    thread.start()
+    yield job_server
+    job_server.shutdown()
+    job_server.server_close()
+
+
+def _url(job_server: JobServer) -> str:
+    """
+    Helper function returning the base URL of a test server.
+    """
+
+    host, port = job_server.server_address
+    return f"http://{host}:{port}"
+
+
+# --- Testing Frame Encoding ---
+
+@pytest.mark.parametrize("shape", [(17, 17), (3, 5), (1, 1), (8, 8)])
+def test_frame_round_trip(shape):
+    grid_state: np.ndarray = (np.random.default_rng(RANDOM_SEED).random(shape) < 0.5).astype(int)
+    np.testing.assert_array_equal(decode_frame(encode_frame(grid_state), shape), grid_state)
+
+
+# --- Testing Run Spec Validation ---
+
+def test_parse_spec_defaults():
+    spec: dict = parse_spec(b'{"steps": 5}')
+    assert spec == {**server.DEFAULT_SPEC, "steps": 5}
+
+
+@pytest.mark.parametrize(
+    "body, error",
+    [
+        (b"not json", ValueError),
+        (b"[1, 2]", TypeError),
+        (b'{"display": "grid"}', ValueError),
+        (b'{"steps": -1}', ValueError),
+        (b'{"rule_string": "S23B9"}', Warning),
+        (b'{"start_choice": "randomize"}', ValueError),
+        (b'{"stride": 0}', ValueError)
+    ]
+)
+def test_parse_spec_invalid(body, error):
+    with pytest.raises(error):
+        parse_spec(body)
+
+
+# --- Testing Jobs ---
+
+# Test that frames streamed from the server match a local rollout, across several segments
+@pytest.mark.parametrize("update_rate", [1.0, 0.5])
+@pytest.mark.parametrize("stride", [1, 3])
+def test_remote_run_matches_local(job_server, monkeypatch, update_rate, stride):
+    monkeypatch.setattr(server, "FRAMES_PER_SEGMENT", 4)
+    spec: dict = {"steps": 40, "start_choice": "gliders", "update_rate": update_rate, "seed": RANDOM_SEED, "stride": stride}
+    ca: CellularAutomaton = CellularAutomaton(START_OPTIONS["gliders"], update_rate=update_rate, rng=np.random.default_rng(RANDOM_SEED))
+    expected: list[tuple[int, np.ndarray]] = list(ca.rollout(40, stride=stride, copy=True))
+
+    run: RemoteRun = RemoteRun(_url(job_server), spec)
+    assert run.start_choice == "gliders"
+    assert run.shape == START_OPTIONS["gliders"].shape
+    frames: list[tuple[int, np.ndarray]] = list(run)
+    assert [generation for generation, _ in frames] == [generation for generation, _ in expected]
+    for (_, state), (_, expected_state) in zip(frames, expected):
+        np.testing.assert_array_equal(state, expected_state)
+
+
+def test_random_choice_resolved(job_server):
+    run: RemoteRun = RemoteRun(_url(job_server), {"steps": 0})
+    assert run.start_choice in START_OPTIONS
+    (_, state), = list(run)
+    np.testing.assert_array_equal(state, START_OPTIONS[run.start_choice])
+
+
+def test_invalid_spec_rejected(job_server):
+    with pytest.raises(ValueError):
+        RemoteRun(_url(job_server), {"steps": -1})
+
+
+# Test that jobs beyond the admission limit are turned away instead of queued
+def test_busy_server_rejects(job_server, monkeypatch):
+    monkeypatch.setattr(job_server, "max_pending", 0)
+    with pytest.raises(RuntimeError, match="503"):
+        RemoteRun(_url(job_server), {"steps": 1})
+
+
+# Test that a run abandoned by its client does not return while a worker is still computing its segment
+def test_abandoned_run_waits_for_segment(job_server, monkeypatch):
+    monkeypatch.setattr(server, "FRAMES_PER_SEGMENT", 4)
+    futures: list[Future] = []
+    submit: Callable[..., Future] = job_server.executor.submit
+    def recording_submit(*args: Any) -> Future:
+        """
+        Submits to the worker pool, recording the future.
+        """
+
+        futures.append(submit(*args))
+        return futures[-1]
+    monkeypatch.setattr(job_server.executor, "submit", recording_submit)
+
+    messages: Iterator[Dict[str, Any]] = job_server.run(parse_spec(b'{"steps": 400, "start_choice": "gliders"}'))
+    next(messages)
+    next(messages)
+    messages.close()
+    assert len(futures) == 3
+    assert all(future.done() for future in futures)
+
+
+def test_health(job_server):
+    with urllib.request.urlopen(_url(job_server) + "/health") as response:
+        health: dict = json.loads(response.read())
+    # Earlier jobs may still be releasing their slots after their last frame was read
+    assert health["workers"] == 1
+    assert health["max_pending"] == server.PENDING_PER_WORKER
+    assert 0 <= health["pending"] <= health["max_pending"]
+
+
+# --- Testing Client Startup ---
+
+# Test that the client path of main.py does not load the simulation, which dominates startup time
+def test_client_skips_simulation_imports():
+    root: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    statement: str = "import sys, main; print(' '.join(sorted(set(sys.modules) & {'sim', 'kernels', 'checkpoint', 'server', 'scipy', 'numba'})))"
+    result: subprocess.CompletedProcess = subprocess.run([sys.executable, "-c", statement], cwd=root, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
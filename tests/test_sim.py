@@ -0,0 +1,308 @@
+import pytest
+import asyncio
+import tracemalloc
+import numpy as np
+from numpy.random import Generator
+
+from sim import CellularAutomaton, SecondOrderCellularAutomaton, _normalize_grid_state
+from starting_states import START_OPTIONS
+from transition_cache import TransitionCache
+
+
+# Fixes random grids and asynchronous updating so tests are deterministic
+RANDOM_SEED: int = 42
+RNG: Generator = np.random.default_rng(RANDOM_SEED)
+RANDOM_GRID: np.ndarray = (RNG.random((24, 31)) < 0.4).astype(int)
+
+
+def _reference_states(
+    grid_state: np.ndarray,
+    steps: int,
+    **ca_kwargs
+) -> list[np.ndarray]:
+    """
+    Helper function that collects grid states by calling step() directly.
+    """
+
+    ca: CellularAutomaton = CellularAutomaton(grid_state, **ca_kwargs)
+    states: list[np.ndarray] = [ca.grid_state.copy()]
+    for _ in range(steps):
+        ca.step()
+        states.append(ca.grid_state.copy())
+    return states
+
+
+# --- Testing Rollout Iterators ---
+
+# Test that rollout yields the same states as stepping by hand
+@pytest.mark.parametrize("start_choice", list(START_OPTIONS.keys()))
+def test_rollout_matches_step(start_choice):
+    start: np.ndarray = START_OPTIONS[start_choice]
+    expected: list[np.ndarray] = _reference_states(start, 10)
+    ca: CellularAutomaton = CellularAutomaton(start)
+    frames: list[tuple[int, np.ndarray]] = list(ca.rollout(10, copy=True))
+    assert [generation for generation, _ in frames] == list(range(11))
+    for (_, state), expected_state in zip(frames, expected):
+        np.testing.assert_array_equal(state, expected_state)
+
+
+# Test that stride computes every step but only yields every k-th generation
+@pytest.mark.parametrize("stride", [1, 2, 3, 7])
+@pytest.mark.parametrize("engine", ["numpy", "auto"])
+def test_rollout_stride(stride, engine):
+    expected: list[np.ndarray] = _reference_states(RANDOM_GRID, 21)
+    ca: CellularAutomaton = CellularAutomaton(RANDOM_GRID, engine=engine)
+    frames: list[tuple[int, np.ndarray]] = list(ca.rollout(21, stride=stride, copy=True))
+    assert [generation for generation, _ in frames] == list(range(0, 22, stride))
+    for generation, state in frames:
+        np.testing.assert_array_equal(state, expected[generation])
+    assert ca.generation == 21
+
+
+# Test that views cannot be used to write into the simulation
+def test_rollout_views_read_only():
+    ca: CellularAutomaton = CellularAutomaton(RANDOM_GRID)
+    _, frame = next(ca.rollout(1))
+    assert np.shares_memory(frame, ca.grid_state)
+    with pytest.raises(ValueError):
+        frame[0, 0] = 1
+
+
+# Test that views collected without copying keep their states while the rollout continues
+@pytest.mark.parametrize("engine", ["auto", "numpy"])
+def test_rollout_views_not_overwritten(engine):
+    expected: list[np.ndarray] = _reference_states(RANDOM_GRID, 6, engine="numpy")
+    ca: CellularAutomaton = CellularAutomaton(RANDOM_GRID, engine=engine)
+    frames: list[tuple[int, np.ndarray]] = list(ca.rollout(6))
+    for generation, state in frames:
+        np.testing.assert_array_equal(state, expected[generation])
+
+
+# Test that a kept reference to a state does not change when stepping on
+def test_step_keeps_earlier_states():
+    ca: CellularAutomaton = CellularAutomaton(RANDOM_GRID)
+    ca.step()
+    kept_state: np.ndarray = ca.grid_state
+    kept_copy: np.ndarray = kept_state.copy()
+    ca.step()
+    ca.step()
+    np.testing.assert_array_equal(kept_state, kept_copy)
+
+
+@pytest.mark.parametrize("stride", [0, -1])
+def test_rollout_invalid_stride(stride):
+    ca: CellularAutomaton = CellularAutomaton(RANDOM_GRID)
+    with pytest.raises(ValueError):
+        next(ca.rollout(5, stride=stride))
+
+
+# Test that the async variant reproduces the synchronous rollout, including seeded async updating
+def test_arollout_matches_rollout():
+    ca: CellularAutomaton = CellularAutomaton(RANDOM_GRID, update_rate=0.5, rng=np.random.default_rng(RANDOM_SEED))
+    expected: list[tuple[int, np.ndarray]] = list(ca.rollout(12, stride=3, copy=True))
+
+    async def collect() -> list[tuple[int, np.ndarray]]:
+        ca: CellularAutomaton = CellularAutomaton(RANDOM_GRID, update_rate=0.5, rng=np.random.default_rng(RANDOM_SEED))
+        return [(generation, state) async for generation, state in ca.arollout(12, stride=3, copy=True)]
+
+    frames: list[tuple[int, np.ndarray]] = asyncio.run(collect())
+    assert [generation for generation, _ in frames] == [generation for generation, _ in expected]
+    for (_, state), (_, expected_state) in zip(frames, expected):
+        np.testing.assert_array_equal(state, expected_state)
+
+
+# Test that the async variant advances whole strides, so strided cache keys are used
+def test_arollout_steps_by_stride():
+    cache: TransitionCache = TransitionCache()
+    ca: CellularAutomaton = CellularAutomaton(RANDOM_GRID, transition_cache=cache)
+
+    async def collect() -> list[tuple[int, np.ndarray]]:
+        return [(generation, state) async for generation, state in ca.arollout(12, stride=4, copy=True)]
+
+    frames: list[tuple[int, np.ndarray]] = asyncio.run(collect())
+    assert [generation for generation, _ in frames] == [0, 4, 8, 12]
+    assert all(key[1] == 4 for key in cache._entries)
+
+
+@pytest.mark.parametrize("n, error", [(2.0, TypeError), ("2", TypeError), (None, TypeError), (-1, ValueError)])
+def test_step_invalid_n(n, error):
+    ca: CellularAutomaton = CellularAutomaton(RANDOM_GRID)
+    with pytest.raises(error):
+        ca.step(n)
+
+
+# --- Testing Grid State Validation ---
+
+@pytest.mark.parametrize(
+    "grid_state",
+    [RANDOM_GRID, RANDOM_GRID.astype(bool), RANDOM_GRID.astype(np.uint8), RANDOM_GRID.astype(float), RANDOM_GRID.tolist()]
+)
+def test_normalize_valid_grid(grid_state):
+    normalized: np.ndarray = _normalize_grid_state(grid_state)
+    assert normalized.dtype == np.dtype(int)
+    np.testing.assert_array_equal(normalized, RANDOM_GRID)
+
+
+@pytest.mark.parametrize(
+    "grid_state, error",
+    [(RANDOM_GRID * 2, ValueError), (RANDOM_GRID - 1, ValueError), (RANDOM_GRID[0], ValueError), ([[0, 1], [1]], TypeError), ([[None]], TypeError)]
+)
+def test_normalize_invalid_grid(grid_state, error):
+    with pytest.raises(error):
+        _normalize_grid_state(grid_state)
+
+
+# Test that copies are only skipped when asked for and trusted states are not scanned
+def test_normalize_copy_and_trusted():
+    assert not np.shares_memory(_normalize_grid_state(RANDOM_GRID), RANDOM_GRID)
+    assert _normalize_grid_state(RANDOM_GRID, copy=False) is RANDOM_GRID
+    assert _normalize_grid_state(RANDOM_GRID, trusted=True, copy=False) is RANDOM_GRID
+    # Trusted arrays are not scanned, untrusted ones are
+    invalid: np.ndarray = RANDOM_GRID * 2
+    assert _normalize_grid_state(invalid, trusted=True, copy=False) is invalid
+    with pytest.raises(ValueError):
+        _normalize_grid_state(invalid, copy=False)
+
+
+# Test that small integer states keep their data type and trusted ones are passed through like int states
+@pytest.mark.parametrize("dtype", [np.uint8, np.int32, np.int64])
+def test_normalize_keeps_integer_dtype(dtype):
+    grid_state: np.ndarray = RANDOM_GRID.astype(dtype)
+    assert _normalize_grid_state(grid_state, trusted=True, copy=False, dtype=None) is grid_state
+    assert _normalize_grid_state(grid_state, copy=False, dtype=None) is grid_state
+    assert _normalize_grid_state(grid_state, copy=False, dtype=np.uint8).dtype == np.uint8
+    assert _normalize_grid_state(RANDOM_GRID.astype(bool), dtype=None).dtype == np.dtype(int)
+
+
+# Test that small cell data types are kept across steps and give the same states as the default
+@pytest.mark.parametrize("update_rate", [1.0, 0.5])
+@pytest.mark.parametrize("engine", ["numpy", "auto"])
+@pytest.mark.parametrize("block_steps", [1, 4])
+def test_uint8_matches_default(update_rate, engine, block_steps):
+    if block_steps > 1 and update_rate < 1.0:
+        pytest.skip("Temporal blocking only applies to synchronous updating")
+    expected: list[np.ndarray] = _reference_states(RANDOM_GRID, 8, update_rate=update_rate, rng=np.random.default_rng(RANDOM_SEED))
+    ca: CellularAutomaton = CellularAutomaton(
+        RANDOM_GRID, update_rate=update_rate, rng=np.random.default_rng(RANDOM_SEED),
+        engine=engine, tile_size=8, block_steps=block_steps, dtype=np.uint8
+    )
+    ca.step(8)
+    assert ca.grid_state.dtype == np.uint8
+    np.testing.assert_array_equal(ca.grid_state, expected[-1])
+
+
+@pytest.mark.parametrize("dtype", [float, bool, np.float32])
+def test_invalid_dtype(dtype):
+    with pytest.raises(ValueError):
+        CellularAutomaton(RANDOM_GRID, dtype=dtype)
+
+
+# --- Testing Second-Order Mode ---
+
+def _second_order_reference(
+    grid_state: np.ndarray,
+    previous_state: np.ndarray,
+    steps: int
+) -> list[np.ndarray]:
+    """
+    Helper function that applies next = first-order step(current) XOR previous with fresh first-order automata.
+    """
+
+    states: list[np.ndarray] = [previous_state, grid_state]
+    for _ in range(steps):
+        ca: CellularAutomaton = CellularAutomaton(states[-1], engine="numpy")
+        ca.step()
+        states.append(ca.grid_state ^ states[-2])
+    return states[1:]
+
+
+@pytest.mark.parametrize("engine", ["numpy", "auto"])
+def test_second_order_matches_reference(engine):
+    previous_state: np.ndarray = np.roll(RANDOM_GRID, 1, axis=0)
+    expected: list[np.ndarray] = _second_order_reference(RANDOM_GRID, previous_state, 15)
+    ca: SecondOrderCellularAutomaton = SecondOrderCellularAutomaton(RANDOM_GRID, previous_state, engine=engine)
+    frames: list[tuple[int, np.ndarray]] = list(ca.rollout(15, copy=True))
+    assert [generation for generation, _ in frames] == list(range(16))
+    for (_, state), expected_state in zip(frames, expected):
+        np.testing.assert_array_equal(state, expected_state)
+
+
+# Test that stepping forwards then backwards restores both the starting and previous states
+@pytest.mark.parametrize("start_choice", list(START_OPTIONS.keys()))
+@pytest.mark.parametrize("engine", ["numpy", "auto"])
+def test_second_order_reversible(start_choice, engine):
+    start: np.ndarray = START_OPTIONS[start_choice]
+    previous_state: np.ndarray = np.fliplr(start)
+    ca: SecondOrderCellularAutomaton = SecondOrderCellularAutomaton(start, previous_state, engine=engine)
+    ca.step(23)
+    ca.step_back(23)
+    assert ca.generation == 0
+    assert ca.direction == 1
+    np.testing.assert_array_equal(ca.grid_state, start)
+    np.testing.assert_array_equal(ca.previous_state, previous_state)
+
+
+# Test that a reversed rollout retraces the forward rollout
+def test_second_order_reverse_rollout():
+    ca: SecondOrderCellularAutomaton = SecondOrderCellularAutomaton(RANDOM_GRID)
+    forward: list[tuple[int, np.ndarray]] = list(ca.rollout(10, copy=True))
+    # After reversing, the current state is generation 9 and the rollout runs back to generation 0
+    ca.reverse()
+    backward: list[tuple[int, np.ndarray]] = list(ca.rollout(9, copy=True))
+    assert [generation for generation, _ in backward] == list(range(9, -1, -1))
+    for (generation, state) in backward:
+        np.testing.assert_array_equal(state, forward[generation][1])
+
+
+# Test that stepping only rotates the three buffers
+def test_second_order_rotates_buffers():
+    ca: SecondOrderCellularAutomaton = SecondOrderCellularAutomaton(RANDOM_GRID)
+    buffers: set[int] = {id(ca.previous_state), id(ca.grid_state), id(ca._next_state)}
+    for _ in range(5):
+        ca.step()
+        assert {id(ca.previous_state), id(ca.grid_state), id(ca._next_state)} == buffers
+    ca.step_back(3)
+    assert {id(ca.previous_state), id(ca.grid_state), id(ca._next_state)} == buffers
+
+
+# Test that rollouts stay correct without copy=True, since the buffers behind the frames are reused
+@pytest.mark.parametrize("engine", ["numpy", "auto"])
+def test_second_order_rollout_copies(engine):
+    expected: list[np.ndarray] = _second_order_reference(RANDOM_GRID, np.zeros_like(RANDOM_GRID), 6)
+    ca: SecondOrderCellularAutomaton = SecondOrderCellularAutomaton(RANDOM_GRID, engine=engine)
+    frames: list[tuple[int, np.ndarray]] = list(ca.rollout(6))
+
+    async def collect() -> list[tuple[int, np.ndarray]]:
+        ca: SecondOrderCellularAutomaton = SecondOrderCellularAutomaton(RANDOM_GRID, engine=engine)
+        return [(generation, state) async for generation, state in ca.arollout(6)]
+
+    async_frames: list[tuple[int, np.ndarray]] = asyncio.run(collect())
+    for (_, state), (_, async_state), expected_state in zip(frames, async_frames, expected):
+        np.testing.assert_array_equal(state, expected_state)
+        np.testing.assert_array_equal(async_state, expected_state)
+
+
+# Test that the NumPy engine steps without allocating temporaries the size of the grid
+def test_second_order_numpy_step_allocates_nothing():
+    grid_state: np.ndarray = (np.random.default_rng(RANDOM_SEED).random((512, 512)) < 0.4).astype(int)
+    ca: SecondOrderCellularAutomaton = SecondOrderCellularAutomaton(grid_state, engine="numpy")
+    ca.step()
+    tracemalloc.start()
+    try:
+        ca.step(10)
+        ca.step_back(10)
+        peak_bytes: int = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    # NumPy keeps a fixed 64 KiB ufunc buffer regardless of the grid size
+    assert peak_bytes < grid_state.nbytes // 8
+
+
+def test_second_order_invalid_inputs():
+    with pytest.raises(ValueError):
+        SecondOrderCellularAutomaton(RANDOM_GRID, RANDOM_GRID[:-1])
+    ca: SecondOrderCellularAutomaton = SecondOrderCellularAutomaton(RANDOM_GRID)
+    with pytest.raises(TypeError):
+        ca.step(1.5)
+    with pytest.raises(ValueError):
+        ca.step_back(-1)
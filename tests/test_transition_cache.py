@@ -0,0 +1,80 @@
+import pytest
+import numpy as np
+from numpy.random import Generator
+
+from sim import CellularAutomaton
+from starting_states import START_OPTIONS
+from transition_cache import TransitionCache
+
+
+# Fixes random grids and asynchronous updating so tests are deterministic
+RANDOM_SEED: int = 42
+RNG: Generator = np.random.default_rng(RANDOM_SEED)
+
+
+# Test that cached rollouts match uncached rollouts, including when the cache is shared
+@pytest.mark.parametrize("start_choice", list(START_OPTIONS.keys()))
+@pytest.mark.parametrize("stride", [1, 3])
+def test_cached_rollout_matches_uncached(start_choice, stride):
+    cache: TransitionCache = TransitionCache()
+    start: np.ndarray = START_OPTIONS[start_choice]
+    expected: list[np.ndarray] = [state for _, state in CellularAutomaton(start).rollout(30, stride=stride, copy=True)]
+    # Run twice so the second run is served from the cache
+    for _ in range(2):
+        ca: CellularAutomaton = CellularAutomaton(start, transition_cache=cache)
+        frames: list[np.ndarray] = [state for _, state in ca.rollout(30, stride=stride, copy=True)]
+        for state, expected_state in zip(frames, expected):
+            np.testing.assert_array_equal(state, expected_state)
+        assert ca.generation == 30
+    assert cache.hits >= 30 // stride
+
+
+# Test that oscillators are served from the cache once a full period has been seen
+def test_oscillator_hit_rate():
+    cache: TransitionCache = TransitionCache()
+    grid_state: np.ndarray = np.zeros((8, 8), dtype=int)
+    grid_state[3, 2:5] = 1  # blinker with period 2
+    ca: CellularAutomaton = CellularAutomaton(grid_state, transition_cache=cache)
+    ca.step()
+    ca.step()
+    assert cache.stats() == {"hits": 0, "misses": 2, "entries": 2, "hit_rate": 0.0}
+    for _ in range(98):
+        ca.step()
+    assert cache.hits == 98 and cache.hit_rate == pytest.approx(0.98)
+
+
+# Test that instances with different rules sharing a cache do not see each other's transitions
+def test_shared_cache_keys_on_rule():
+    cache: TransitionCache = TransitionCache()
+    grid_state: np.ndarray = (RNG.random((10, 10)) < 0.4).astype(int)
+    life: CellularAutomaton = CellularAutomaton(grid_state, transition_cache=cache)
+    other: CellularAutomaton = CellularAutomaton(grid_state, survive_set={1, 2}, birth_set={3, 4}, transition_cache=cache)
+    reference: CellularAutomaton = CellularAutomaton(grid_state, survive_set={1, 2}, birth_set={3, 4})
+    life.step()
+    other.step()
+    reference.step()
+    assert cache.hits == 0
+    np.testing.assert_array_equal(other.grid_state, reference.grid_state)
+
+
+def test_lru_eviction():
+    cache: TransitionCache = TransitionCache(max_entries=3)
+    ca: CellularAutomaton = CellularAutomaton((RNG.random((10, 10)) < 0.4).astype(int), transition_cache=cache)
+    for _ in range(10):
+        ca.step()
+    assert len(cache) == 3
+
+
+# Test that asynchronous updates and large grids bypass the cache
+def test_cache_bypass():
+    cache: TransitionCache = TransitionCache(max_cells=100)
+    asynchronous: CellularAutomaton = CellularAutomaton(
+        np.zeros((5, 5)),
+        update_rate=0.5,
+        rng=np.random.default_rng(RANDOM_SEED),
+        transition_cache=cache
+    )
+    large: CellularAutomaton = CellularAutomaton(np.zeros((11, 11)), transition_cache=cache)
+    asynchronous.step()
+    large.step()
+    assert cache.stats()["entries"] == 0 and cache.hits + cache.misses == 0
@@ -0,0 +1,148 @@
+import numpy as np
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Tuple
+
+from rules import Rule
+
+
+# Boards above this many cells are stepped without caching since they rarely repeat exactly
+DEFAULT_MAX_CELLS: int = 64 * 64
+DEFAULT_MAX_ENTRIES: int = 65536
+
+
+class TransitionCache:
+    """
+    Size-bounded LRU cache of grid state transitions for small, synchronously updated boards.
+    Keys combine the rule, the number of steps and the bit-packed grid state, so one cache
+    can be shared by any number of CellularAutomaton instances, including ones with different rules.
+    Asynchronous updates are never cached because they depend on the RNG.
+    Safe to share between threads.
+
+    Attributes
+    ----------
+    max_entries : int
+        Maximum number of cached transitions. The least recently used transition is evicted first.
+    max_cells : int
+        Grids with more cells than this bypass the cache.
+    hits : int
+        Number of lookups that found a cached transition.
+    misses : int
+        Number of lookups that had to be computed.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_cells: int = DEFAULT_MAX_CELLS
+    ):
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be a positive integer. Received {max_entries}.")
+
+        self.max_entries: int = max_entries
+        self.max_cells: int = max_cells
+        self.hits: int = 0
+        self.misses: int = 0
+        # Maps keys to bit-packed states, ordered from least to most recently used
+        self._entries: OrderedDict[Hashable, np.ndarray] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+
+    def key(
+        self,
+        grid_state: np.ndarray,
+        rule: Rule,
+        steps: int
+    ) -> Hashable | None:
+        """
+        Builds the cache key for advancing grid_state by steps under a rule.
+        Returns None if the grid is too large to cache.
+        """
+
+        if grid_state.size > self.max_cells:
+            return None
+        # Packing 8 cells per byte keeps keys small and makes hashing them cheap
+        packed_state: bytes = np.packbits(grid_state.astype(bool, copy=False), axis=None).tobytes()
+        return rule, steps, grid_state.shape, packed_state
+
+
+    def get(
+        self,
+        key: Hashable,
+        dtype: np.dtype = int
+    ) -> np.ndarray | None:
+        """
+        Returns the cached state for key as a new array of dtype, or None if it is not cached.
+        """
+
+        with self._lock:
+            packed_state: np.ndarray | None = self._entries.get(key)
+            if packed_state is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+
+        # Unpack outside the lock, the shape is stored in the key
+        shape: Tuple[int, int] = key[2]
+        return np.unpackbits(packed_state, count=shape[0] * shape[1]).reshape(shape).astype(dtype)
+
+
+    def put(
+        self,
+        key: Hashable,
+        grid_state: np.ndarray
+    ) -> None:
+        """
+        Caches grid_state as the result for key, evicting the least recently used entries if full.
+        """
+
+        packed_state: np.ndarray = np.packbits(grid_state.astype(bool, copy=False), axis=None)
+        with self._lock:
+            self._entries[key] = packed_state
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Fraction of lookups served from the cache. 0.0 before any lookups.
+        """
+
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the number of hits, misses and entries, and the hit rate.
+        """
+
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "hit_rate": self.hit_rate
+            }
+
+
+    def clear(self) -> None:
+        """
+        Removes all cached transitions and resets the hit and miss counts.
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self.hits: int = 0
+            self.misses: int = 0
+
+
+    def __len__(self) -> int:
+        """
+        Returns the number of cached transitions.
+        """
+
+        return len(self._entries)
@@ -1,24 +1,88 @@
-import re
 import numpy as np
+from typing import Any, Dict, Iterable, Tuple
+from numpy.typing import ArrayLike
 
 from starting_states import START_OPTIONS
+from rules import parse_rule
 
 
 # Specify valid options so that invalid alternatives can raise errors
 VALID_START_OPTIONS: list[str] = list(START_OPTIONS.keys()) + ["randomize", "random_choice"]
 MIN_SECONDS_PER_STEP: float = 0.01 # too low of values may stress the FPS and be impossible to see clearly regardless.
+DISPLAY_MODES: Tuple[str, ...] = ("grid", "half", "braille")  # see _PIXELS_PER_CHAR in render.py
 
-def validate_inputs(
+def _normalize_grid_state(
+    grid_state: ArrayLike,
+    trusted: bool = False,
+    copy: bool = True,
+    dtype: np.dtype | None = int
+) -> np.ndarray:
+    """
+    Helper function for checking whether grid state is proper binary 2D array.
+    Also converts array-like to np.ndarray.
+
+    Parameters
+    ----------
+    grid_state : array-like
+        Grid state array to test and potentially convert.
+    trusted : bool
+        If True and grid_state is already a 2D integer numpy array, e.g. a state produced by
+        CellularAutomaton.step(), the scan over every cell is skipped.
+    copy : bool
+        If False, grid_state is returned without copying when it already has the requested data type.
+    dtype : np.dtype or None
+        Integer data type of the returned array. If None, integer arrays keep their data type and others become int.
+
+    Returns
+    ----------
+    grid_state : np.ndarray
+        Grid state now as an integer numpy array.
+    """
+
+    # --- Trusted Fast Path ---
+    # States produced by the simulation are binary by construction, only the cheap flags are checked
+    if (
+        trusted
+        and isinstance(grid_state, np.ndarray)
+        and grid_state.ndim == 2
+        and grid_state.dtype.kind in "iu"
+        and (dtype is None or grid_state.dtype == dtype)
+    ):
+        return grid_state.copy() if copy else grid_state
+
+    # Convert to numpy array if not already. Raise error if not possible.
+    try:
+        grid_state: np.ndarray = np.asarray(grid_state)
+        # Boolean and integer arrays are range checked below without an extra conversion pass
+        if grid_state.dtype.kind not in "biu":
+            grid_state: np.ndarray = grid_state.astype(int)
+    except (TypeError, ValueError) as e:
+        raise TypeError("grid_state must be array-like.") from e
+    
+    # Enforce a 2D discrete grid space
+    # Ensure that matrix is rank 2
+    if grid_state.ndim != 2:
+        raise ValueError(f"grid_state must be 2 dimensional. Received shape {grid_state.shape}.")
+    # Ensure that grid is binary. Booleans always are, integers only need their minimum and maximum checked
+    if grid_state.dtype != bool and grid_state.size and (grid_state.min() < 0 or grid_state.max() > 1):
+        raise ValueError("All cells in grid_state must be 0 or 1.")
+
+    # Checked in place above, so the only copy made is the cast to the requested data type
+    if dtype is None:
+        dtype: np.dtype = grid_state.dtype if grid_state.dtype.kind in "iu" else np.dtype(int)
+    return grid_state.astype(dtype, copy=copy)
+
+
+def validate_run_spec(
     steps: int,
     rule_string: str,
     start_choice: str,
     update_rate: float,
-    seed: int,
-    seconds_per_step: float
+    seed: int
 ) -> None:
     """
-    Checks validity of user inputs, raising errors when invalid. 
-    Parameters are the same supplied by the user in the CLI.
+    Checks validity of the parameters defining a simulation run, raising errors when invalid.
+    Shared by the CLI and the job server, which receives run specs without display options.
     """
 
     # Check that number of steps is non-negative integer
@@ -27,12 +91,9 @@ def validate_inputs(
     if steps < 0:
         raise ValueError("Cannot have negative steps of the simulation.")
     
-    # Check that rule string is in valid format S<digits>B<digits>
-    if not re.fullmatch(string=rule_string, pattern=r"S\d*B\d*"):
-        raise ValueError("--rule-string must follow the pattern S<digits>B<digits>. No other characters are allowed.")
-    # Check that rule is possible (a cell can have at maximum 8 living neighbors)
-    if "9" in rule_string:
-        raise Warning("--rule_string includes 9 but there cannot be more than 8 living neighbors")
+    # Check that rule string is in valid format S<digits>B<digits> and only uses possible counts
+    # Parsing is cached, so repeated rules in a sweep are only checked once
+    parse_rule(rule_string)
 
     # Check that start state is valid option
     if start_choice not in VALID_START_OPTIONS:
@@ -44,14 +105,95 @@ def validate_inputs(
     if not (0 <= update_rate <= 1.0):
         raise ValueError("--update-rate must be between 0 and 1")
     
-    # Check that seed is valid input for numpy.random.Generator
-    try:
-        np.random.default_rng(seed)
-    except (TypeError, ValueError) as e:
-        raise ValueError("--seed must be int int or None") from e
-    
+    # Check that seed is valid input for numpy.random.Generator without constructing one
+    if seed is not None:
+        if not isinstance(seed, (int, np.integer)):
+            raise TypeError("--seed must be int or None")
+        if seed < 0:
+            raise ValueError("--seed must be non-negative")
+
+
+def validate_inputs(
+    steps: int,
+    rule_string: str,
+    start_choice: str,
+    update_rate: float,
+    seed: int,
+    seconds_per_step: float,
+    checkpoint_every: int = 100,
+    display: str = "grid",
+    zoom: int | None = None,
+    memory_cap: int | None = None,
+    threads: int | None = None
+) -> None:
+    """
+    Checks validity of user inputs, raising errors when invalid. 
+    Parameters are the same supplied by the user in the CLI.
+    """
+
+    # Check the parameters that define the simulation itself
+    validate_run_spec(steps, rule_string, start_choice, update_rate, seed)
+
     # Check that seconds_per_step is a valid type and reasonable value
     if not isinstance(seconds_per_step, (int, float)):
         raise TypeError("--seconds-per-step must be a number.")
     if seconds_per_step <= MIN_SECONDS_PER_STEP:
         raise ValueError(f"--seconds-per-step must be greater than {MIN_SECONDS_PER_STEP}.")
+
+    # Check that checkpoint interval is a positive integer
+    if not isinstance(checkpoint_every, int):
+        raise TypeError("--checkpoint-every must be an integer.")
+    if checkpoint_every < 1:
+        raise ValueError("--checkpoint-every must be at least 1.")
+
+    # Check that display mode is valid option
+    if display not in DISPLAY_MODES:
+        raise ValueError(f"--display must be one of {', '.join(DISPLAY_MODES)}.")
+
+    # Check that zoom is None or a positive integer
+    if zoom is not None:
+        if not isinstance(zoom, int):
+            raise TypeError("--zoom must be an integer.")
+        if zoom < 1:
+            raise ValueError("--zoom must be at least 1.")
+
+    # Check that the planner limits are None or positive integers
+    if memory_cap is not None:
+        if not isinstance(memory_cap, int):
+            raise TypeError("--memory-cap must be an integer.")
+        if memory_cap < 1:
+            raise ValueError("--memory-cap must be at least 1.")
+    if threads is not None:
+        if not isinstance(threads, int):
+            raise TypeError("--threads must be an integer.")
+        if threads < 1:
+            raise ValueError("--threads must be at least 1.")
+
+
+def validate_batch(
+    jobs: Iterable[Dict[str, Any]]
+) -> Dict[int, Exception]:
+    """
+    Validates a list of sweep jobs without stopping at the first invalid one.
+    Each job is a dict of validate_inputs() keyword arguments.
+    Rule strings repeated across jobs are only parsed once.
+
+    Parameters
+    ----------
+    jobs : iterable of dict
+        Keyword arguments for validate_inputs(), one dict per job.
+
+    Returns
+    ----------
+    errors : dict
+        Maps the index of each invalid job to the error it raised. Empty if every job is valid.
+    """
+
+    errors: Dict[int, Exception] = {}
+    for index, job in enumerate(jobs):
+        try:
+            validate_inputs(**job)
+        # Invalid rules with a 9 raise Warning rather than ValueError
+        except (TypeError, ValueError, Warning) as e:
+            errors[index] = e
+    return errors